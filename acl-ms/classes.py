@@ -1,8 +1,28 @@
-from typing import Any, Dict, List
+import time
+from typing import Any, Dict, Iterator, List, Tuple
 
 import pandas as pd
 from neo4j import GraphDatabase
 
+DEFAULT_BATCH_SIZE: int = 1000
+
+
+def _chunks(rows: List[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    for i in range(0, len(rows), size):
+        yield rows[i : i + size]
+
+
+def _run_chunk(tx, query: str, rows: List[Dict[str, Any]]):
+    # runs inside a managed write transaction, retried on transient errors
+    return tx.run(query, rows=rows).consume()
+
+
+def _merge_relationship_chunk(tx, query: str, rows: List[Dict[str, Any]]):
+    result = tx.run(query, rows=rows)
+    matched = result.single()["matched"]
+    created = result.consume().counters.relationships_created
+    return matched, created
+
 
 class Neo4jManager:
     def __init__(self, uri: str, username: str, password: str):
@@ -13,9 +33,32 @@ class Neo4jManager:
             self.driver.close()
 
     def create_nodes_from_dataframe(
-        self, df: pd.DataFrame, label: str, unique_key: str = None
+        self,
+        df: pd.DataFrame,
+        label: str,
+        unique_key: str = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
     ):
-        records = df.to_dict("records")
+        records = [
+            {k: v for k, v in record.items() if pd.notna(v)}
+            for record in df.to_dict("records")
+        ]
+
+        # rows that carry the unique key are merged, the rest are created
+        if unique_key:
+            merge_rows = [props for props in records if unique_key in props]
+            create_rows = [props for props in records if unique_key not in props]
+        else:
+            merge_rows = []
+            create_rows = records
+
+        merge_query = (
+            f"UNWIND $rows AS props "
+            f"MERGE (n:{label} {{{unique_key}: props.{unique_key}}}) SET n = props"
+        )
+        create_query = f"UNWIND $rows AS props CREATE (n:{label}) SET n = props"
+
+        start_time = time.time()
 
         with self.driver.session() as session:
             if unique_key:
@@ -28,17 +71,17 @@ class Neo4jManager:
                     print(f"Note: Could not create constraint - {e}")
 
             count = 0
-            for record in records:
-                props = {k: v for k, v in record.items() if pd.notna(v)}
-
-                query = f"CREATE (n:{label} $props)"
-                if unique_key and unique_key in props:
-                    query = f"MERGE (n:{label} {{{unique_key}: $props.{unique_key}}}) SET n = $props"
-
-                session.run(query, props=props)
-                count += 1
-
-            return count
+            for query, rows in ((merge_query, merge_rows), (create_query, create_rows)):
+                for chunk in _chunks(rows, batch_size):
+                    session.execute_write(_run_chunk, query, chunk)
+                    count += len(chunk)
+
+        elapsed_time = time.time() - start_time
+        rate = count / elapsed_time if elapsed_time > 0 else float("inf")
+        print(
+            f"Loaded {count} {label} nodes in {elapsed_time:.2f}s ({rate:.0f} rows/sec)"
+        )
+        return count
 
     def create_relationship(
         self,
@@ -82,26 +125,114 @@ class Neo4jManager:
         to_column: str,
         relationship_type: str,
         property_columns: List[str] = None,
-    ):
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> Dict[str, Any]:
+        # rows without both endpoint keys can never match, drop them up front
+        df = df.dropna(subset=[from_column, to_column])
+
+        from_values = df[from_column].tolist()
+        to_values = df[to_column].tolist()
+        property_values = {col: df[col].tolist() for col in property_columns or []}
+
+        rows = []
+        for i in range(len(from_values)):
+            props = {
+                col: values[i]
+                for col, values in property_values.items()
+                if pd.notna(values[i])
+            }
+            rows.append(
+                {"from_value": from_values[i], "to_value": to_values[i], "props": props}
+            )
+
+        query = f"""
+        UNWIND $rows AS row
+        MATCH (a:{from_label} {{{from_key}: row.from_value}})
+        MATCH (b:{to_label} {{{to_key}: row.to_value}})
+        MERGE (a)-[r:{relationship_type}]->(b)
+        SET r += row.props
+        RETURN count(r) AS matched
+        """
+
+        stats = {"matched": 0, "created": 0, "chunks": []}
+        start_time = time.time()
+
+        with self.driver.session() as session:
+            for chunk in _chunks(rows, batch_size):
+                matched, created = session.execute_write(
+                    _merge_relationship_chunk, query, chunk
+                )
+                stats["matched"] += matched
+                stats["created"] += created
+                stats["chunks"].append({"matched": matched, "created": created})
+
+        elapsed_time = time.time() - start_time
+        rate = len(rows) / elapsed_time if elapsed_time > 0 else float("inf")
+        print(
+            f"{relationship_type}: matched {stats['matched']}/{len(rows)} rows, "
+            f"created {stats['created']} relationships "
+            f"in {elapsed_time:.2f}s ({rate:.0f} rows/sec)"
+        )
+        return stats
+
+    def delete_nodes(
+        self,
+        label: str,
+        key: str,
+        values: List[Any],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> int:
+        query = f"""
+        UNWIND $rows AS value
+        MATCH (n:{label} {{{key}: value}})
+        DETACH DELETE n
+        """
+
         count = 0
+        with self.driver.session() as session:
+            for chunk in _chunks(values, batch_size):
+                summary = session.execute_write(_run_chunk, query, chunk)
+                count += summary.counters.nodes_deleted
 
-        for _, row in df.iterrows():
-            props = {}
-            if property_columns:
-                props = {
-                    col: row[col] for col in property_columns if pd.notna(row[col])
-                }
-
-            if self.create_relationship(
-                from_label,
-                from_key,
-                row[from_column],
-                to_label,
-                to_key,
-                row[to_column],
-                relationship_type,
-                props,
-            ):
-                count += 1
+        return count
+
+    def delete_relationships(
+        self,
+        from_label: str,
+        from_key: str,
+        to_label: str,
+        to_key: str,
+        relationship_type: str,
+        pairs: List[Tuple[Any, Any]],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> int:
+        rows = [{"from_value": a, "to_value": b} for a, b in pairs]
+        query = f"""
+        UNWIND $rows AS row
+        MATCH (a:{from_label} {{{from_key}: row.from_value}})
+              -[r:{relationship_type}]->
+              (b:{to_label} {{{to_key}: row.to_value}})
+        DELETE r
+        """
+
+        count = 0
+        with self.driver.session() as session:
+            for chunk in _chunks(rows, batch_size):
+                summary = session.execute_write(_run_chunk, query, chunk)
+                count += summary.counters.relationships_deleted
 
         return count
+
+    def stamp_graph_version(self) -> str:
+        # query services drop their cached results once this stamp changes
+        version = str(time.time_ns())
+        query = """
+        MERGE (v:GraphVersion {name: 'graph'})
+        SET v.version = $version, v.loaded_at = datetime()
+        """
+
+        with self.driver.session() as session:
+            session.execute_write(lambda tx: tx.run(query, version=version).consume())
+
+        print(f"Stamped graph version {version}")
+        return version
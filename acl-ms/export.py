@@ -0,0 +1,106 @@
+import os
+import sys
+from typing import Dict, List
+
+import pandas as pd
+from main import data_cleaning
+from sync import NODE_KEYS, RELATIONSHIP_SPECS, _as_id
+from tables import TableRegistry
+
+
+def _header_type(series: pd.Series) -> str:
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return ""
+    kind = series.dtype.kind
+    if kind in "iu":
+        return ":long"
+    if kind == "f":
+        return ":double"
+    if kind == "b":
+        return ":boolean"
+    return ""
+
+
+def export_node_file(df: pd.DataFrame, label: str, key: str, output_dir: str) -> str:
+    df = df.dropna(subset=[key]).drop_duplicates(subset=[key], keep="last").copy()
+    df[key] = _as_id(df[key])
+
+    header = [f"{column}{_header_type(df[column])}" for column in df.columns]
+    ids = df[key]
+    df.columns = header
+    # the id column only feeds the ID space, the key is also kept as a typed
+    # property so numeric ids stay numbers in the graph
+    df.insert(0, f":ID({label})", ids)
+    df[":LABEL"] = label
+
+    path = os.path.join(output_dir, f"nodes_{label}.csv")
+    df.to_csv(path, index=False)
+    return path
+
+
+def export_relationship_file(
+    df: pd.DataFrame, name: str, spec: Dict, output_dir: str
+) -> str:
+    key_columns = [spec["from_column"], spec["to_column"]]
+    df = df[key_columns + spec["property_columns"]]
+    df = df.dropna(subset=key_columns).drop_duplicates(subset=key_columns, keep="last")
+
+    out = pd.DataFrame(
+        {
+            f":START_ID({spec['from_label']})": _as_id(df[spec["from_column"]]),
+            f":END_ID({spec['to_label']})": _as_id(df[spec["to_column"]]),
+        }
+    )
+    for column in spec["property_columns"]:
+        out[f"{column}{_header_type(df[column])}"] = df[column]
+    out[":TYPE"] = spec["relationship_type"]
+
+    file_name = name.replace(" ", "_").replace("(", "").replace(")", "")
+    path = os.path.join(output_dir, f"rels_{file_name}.csv")
+    out.to_csv(path, index=False)
+    return path
+
+
+def export_admin_import(tables: TableRegistry, output_dir: str) -> List[str]:
+    """Write header-annotated CSVs for `neo4j-admin database import full`."""
+    os.makedirs(output_dir, exist_ok=True)
+
+    traveller_df, hotel_df, city_df, country_df, review_df, visa_df = data_cleaning(
+        tables
+    )
+    node_frames = {
+        "Traveller": traveller_df,
+        "Hotel": hotel_df,
+        "City": city_df,
+        "Country": country_df,
+        "Review": review_df,
+        "Visa": visa_df,
+    }
+
+    node_files = [
+        export_node_file(df, label, NODE_KEYS[label], output_dir)
+        for label, df in node_frames.items()
+    ]
+    relationship_files = [
+        export_relationship_file(spec["source"](tables), name, spec, output_dir)
+        for name, spec in RELATIONSHIP_SPECS.items()
+    ]
+
+    print(
+        f"Exported {len(node_files)} node files and "
+        f"{len(relationship_files)} relationship files to {output_dir}"
+    )
+    print("Import with:")
+    print(
+        # review bodies are free text and may contain newlines
+        "  neo4j-admin database import full neo4j --multiline-fields=true "
+        + " ".join(f"--nodes={path}" for path in node_files)
+        + " "
+        + " ".join(f"--relationships={path}" for path in relationship_files)
+    )
+    return node_files + relationship_files
+
+
+if __name__ == "__main__":
+    output_dir = sys.argv[1] if len(sys.argv) > 1 else "../import"
+    export_admin_import(TableRegistry(".."), output_dir)
@@ -1,5 +1,8 @@
 import pandas as pd
 from classes import Neo4jManager
+from pipeline import BuildScheduler
+from sync import incremental_sync
+from tables import TableRegistry
 
 
 def read_config(config_file):
@@ -14,11 +17,28 @@ def read_config(config_file):
     return config
 
 
-def data_cleaning():
-    df_reviews = pd.read_csv("../reviews.csv")
-    df_users = pd.read_csv("../users.csv")
-    df_hotels = pd.read_csv("../hotels.csv")
-    df_visa = pd.read_csv("../visa.csv")
+REVIEW_COLUMNS = [
+    "review_id",
+    "review_text",
+    "review_date",
+    "score_overall",
+    "score_cleanliness",
+    "score_comfort",
+    "score_facilities",
+    "score_location",
+    "score_staff",
+    "score_value_for_money",
+]
+
+
+def clean_reviews(df_reviews: pd.DataFrame) -> pd.DataFrame:
+    return df_reviews[REVIEW_COLUMNS].copy()
+
+
+def data_cleaning(tables: TableRegistry, include_reviews: bool = True):
+    df_users = tables.users
+    df_hotels = tables.hotels.copy()
+    df_visa = tables.visa
 
     traveller_df = df_users[
         ["user_id", "age_group", "traveller_type", "user_gender"]
@@ -65,20 +85,8 @@ def data_cleaning():
     country_df = country_df.drop_duplicates().reset_index(drop=True)
     country_df = country_df.rename(columns={"country": "country_name"})
 
-    review_df = df_reviews[
-        [
-            "review_id",
-            "review_text",
-            "review_date",
-            "score_overall",
-            "score_cleanliness",
-            "score_comfort",
-            "score_facilities",
-            "score_location",
-            "score_staff",
-            "score_value_for_money",
-        ]
-    ].copy()
+    # when streaming, reviews are cleaned chunk by chunk in stream_reviews
+    review_df = clean_reviews(tables.reviews) if include_reviews else None
 
     # Create visa dataframe with unique identifier
     visa_df = df_visa.copy()
@@ -90,8 +98,11 @@ def data_cleaning():
     return (traveller_df, hotel_df, city_df, country_df, review_df, visa_df)
 
 
-def create_wrote_relationship(manager: Neo4jManager):
-    df_reviews = pd.read_csv("../reviews.csv")
+def create_wrote_relationship(
+    manager: Neo4jManager, tables: TableRegistry, df_reviews: pd.DataFrame = None
+):
+    if df_reviews is None:
+        df_reviews = tables.reviews
 
     manager.create_relationships_from_dataframe(
         df=df_reviews,
@@ -106,8 +117,8 @@ def create_wrote_relationship(manager: Neo4jManager):
     print("done creating wrote relationship")
 
 
-def create_from_country_relationship(manager: Neo4jManager):
-    df_users = pd.read_csv("../users.csv")
+def create_from_country_relationship(manager: Neo4jManager, tables: TableRegistry):
+    df_users = tables.users
     manager.create_relationships_from_dataframe(
         df=df_users,
         from_label="Traveller",
@@ -121,17 +132,14 @@ def create_from_country_relationship(manager: Neo4jManager):
     print("done creating from country relationship")
 
 
-def create_stayed_at_relationship(manager: Neo4jManager):
-    df_users = pd.read_csv("../users.csv")
-    df_hotels = pd.read_csv("../hotels.csv")
-    df_reviews = pd.read_csv("../reviews.csv")
-    df_reviews_and_hotels = df_reviews.merge(df_hotels, on="hotel_id", how="left")
-    df_users_and_reviews_and_hotels = df_users.merge(
-        df_reviews_and_hotels, on="user_id", how="left"
-    )
+def create_stayed_at_relationship(
+    manager: Neo4jManager, tables: TableRegistry, df_stays: pd.DataFrame = None
+):
+    if df_stays is None:
+        df_stays = tables.stayed_at
 
     manager.create_relationships_from_dataframe(
-        df=df_users_and_reviews_and_hotels,
+        df=df_stays,
         from_label="Traveller",
         from_key="user_id",
         from_column="user_id",
@@ -143,8 +151,11 @@ def create_stayed_at_relationship(manager: Neo4jManager):
     print("done creating stayed at relationship")
 
 
-def create_reviewed_relationship(manager: Neo4jManager):
-    df_reviews = pd.read_csv("../reviews.csv")
+def create_reviewed_relationship(
+    manager: Neo4jManager, tables: TableRegistry, df_reviews: pd.DataFrame = None
+):
+    if df_reviews is None:
+        df_reviews = tables.reviews
 
     manager.create_relationships_from_dataframe(
         df=df_reviews,
@@ -159,8 +170,8 @@ def create_reviewed_relationship(manager: Neo4jManager):
     print("done creating reviewed relationship")
 
 
-def create_located_in_relationship(manager: Neo4jManager):
-    df_hotels = pd.read_csv("../hotels.csv")
+def create_located_in_relationship(manager: Neo4jManager, tables: TableRegistry):
+    df_hotels = tables.hotels
 
     manager.create_relationships_from_dataframe(
         df=df_hotels,
@@ -175,8 +186,10 @@ def create_located_in_relationship(manager: Neo4jManager):
     print("done creating located in relationship")
 
 
-def create_located_in_city_country_relationship(manager: Neo4jManager):
-    df_hotels = pd.read_csv("../hotels.csv")
+def create_located_in_city_country_relationship(
+    manager: Neo4jManager, tables: TableRegistry
+):
+    df_hotels = tables.hotels
 
     manager.create_relationships_from_dataframe(
         df=df_hotels,
@@ -191,8 +204,8 @@ def create_located_in_city_country_relationship(manager: Neo4jManager):
     print("done creating located in city country relationship")
 
 
-def create_needs_visa_relationship(manager: Neo4jManager):
-    df_visa = pd.read_csv("../visa.csv")
+def create_needs_visa_relationship(manager: Neo4jManager, tables: TableRegistry):
+    df_visa = tables.visa
 
     df_visa_required = df_visa[df_visa["requires_visa"] == "Yes"].copy()
 
@@ -210,36 +223,161 @@ def create_needs_visa_relationship(manager: Neo4jManager):
     print("done creating visa relationship")
 
 
+def stream_reviews(manager: Neo4jManager, tables: TableRegistry, chunksize: int):
+    # only one chunk of reviews is ever held in memory, each one is pushed as
+    # Review nodes plus its WROTE, REVIEWED and STAYED_AT edges before the next
+    total = 0
+    for chunk_num, df_reviews in enumerate(tables.iter_chunks("reviews", chunksize), 1):
+        manager.create_nodes_from_dataframe(
+            clean_reviews(df_reviews), "Review", "review_id"
+        )
+        create_wrote_relationship(manager, tables, df_reviews)
+        create_reviewed_relationship(manager, tables, df_reviews)
+        create_stayed_at_relationship(
+            manager, tables, df_reviews[["user_id", "hotel_id"]].drop_duplicates()
+        )
+
+        total += len(df_reviews)
+        print(f"done streaming review chunk {chunk_num} ({total} reviews so far)")
+
+
+def build_graph(
+    manager: Neo4jManager,
+    tables: TableRegistry,
+    max_workers: int = 4,
+    review_chunksize: int = None,
+):
+    streaming = review_chunksize is not None
+    traveller_df, hotel_df, city_df, country_df, review_df, visa_df = data_cleaning(
+        tables, include_reviews=not streaming
+    )
+
+    scheduler = BuildScheduler(max_workers=max_workers)
+
+    # Nodes:
+    scheduler.add_step(
+        "Traveller",
+        lambda: manager.create_nodes_from_dataframe(
+            traveller_df, "Traveller", "user_id"
+        ),
+    )
+    scheduler.add_step(
+        "Hotel",
+        lambda: manager.create_nodes_from_dataframe(hotel_df, "Hotel", "hotel_id"),
+    )
+    scheduler.add_step(
+        "City", lambda: manager.create_nodes_from_dataframe(city_df, "City", "city_id")
+    )
+    scheduler.add_step(
+        "Country",
+        lambda: manager.create_nodes_from_dataframe(
+            country_df, "Country", "country_id"
+        ),
+    )
+    scheduler.add_step(
+        "Visa", lambda: manager.create_nodes_from_dataframe(visa_df, "Visa", "visa_id")
+    )
+
+    # Relationships, each waits only for the node labels it connects:
+    if streaming:
+        scheduler.add_step(
+            "Review stream",
+            lambda: stream_reviews(manager, tables, review_chunksize),
+            depends_on=["Traveller", "Hotel"],
+        )
+    else:
+        scheduler.add_step(
+            "Review",
+            lambda: manager.create_nodes_from_dataframe(
+                review_df, "Review", "review_id"
+            ),
+        )
+        scheduler.add_step(
+            "WROTE",
+            lambda: create_wrote_relationship(manager, tables),
+            depends_on=["Traveller", "Review"],
+        )
+        scheduler.add_step(
+            "STAYED_AT",
+            lambda: create_stayed_at_relationship(manager, tables),
+            depends_on=["Traveller", "Hotel"],
+        )
+        scheduler.add_step(
+            "REVIEWED",
+            lambda: create_reviewed_relationship(manager, tables),
+            depends_on=["Review", "Hotel"],
+        )
+
+    scheduler.add_step(
+        "FROM_COUNTRY",
+        lambda: create_from_country_relationship(manager, tables),
+        depends_on=["Traveller", "Country"],
+    )
+    scheduler.add_step(
+        "LOCATED_IN (Hotel-City)",
+        lambda: create_located_in_relationship(manager, tables),
+        depends_on=["Hotel", "City"],
+    )
+    scheduler.add_step(
+        "LOCATED_IN (City-Country)",
+        lambda: create_located_in_city_country_relationship(manager, tables),
+        depends_on=["City", "Country"],
+    )
+    scheduler.add_step(
+        "NEEDS_VISA",
+        lambda: create_needs_visa_relationship(manager, tables),
+        depends_on=["Country"],
+    )
+
+    scheduler.run()
+
+
+def sync_graph(manager: Neo4jManager, tables: TableRegistry, manifest_path: str):
+    traveller_df, hotel_df, city_df, country_df, review_df, visa_df = data_cleaning(
+        tables
+    )
+
+    incremental_sync(
+        manager,
+        tables,
+        {
+            "Traveller": traveller_df,
+            "Hotel": hotel_df,
+            "City": city_df,
+            "Country": country_df,
+            "Review": review_df,
+            "Visa": visa_df,
+        },
+        manifest_path,
+    )
+
+
 def main():
     config = read_config("../config.txt")
 
     URI = config.get("URI")
     USERNAME = config.get("USERNAME")
     PASSWORD = config.get("PASSWORD")
+    BUILD_WORKERS = int(config.get("BUILD_WORKERS", 4))
+    # stream reviews.csv in chunks of this many rows instead of loading it whole
+    REVIEW_CHUNKSIZE = config.get("REVIEW_CHUNKSIZE")
+    # only push rows that changed since the run recorded in this manifest
+    SYNC_MANIFEST = config.get("SYNC_MANIFEST")
 
     manager = Neo4jManager(URI, USERNAME, PASSWORD)
+    tables = TableRegistry("..")
 
     try:
-        traveller_df, hotel_df, city_df, country_df, review_df, visa_df = (
-            data_cleaning()
-        )
-
-        # Create nodes:
-        manager.create_nodes_from_dataframe(traveller_df, "Traveller", "user_id")
-        manager.create_nodes_from_dataframe(hotel_df, "Hotel", "hotel_id")
-        manager.create_nodes_from_dataframe(city_df, "City", "city_id")
-        manager.create_nodes_from_dataframe(country_df, "Country", "country_id")
-        manager.create_nodes_from_dataframe(review_df, "Review", "review_id")
-        manager.create_nodes_from_dataframe(visa_df, "Visa", "visa_id")
-
-        # Create relationships:
-        create_wrote_relationship(manager)
-        create_from_country_relationship(manager)
-        create_stayed_at_relationship(manager)
-        create_reviewed_relationship(manager)
-        create_located_in_relationship(manager)
-        create_located_in_city_country_relationship(manager)
-        create_needs_visa_relationship(manager)
+        if SYNC_MANIFEST:
+            sync_graph(manager, tables, SYNC_MANIFEST)
+        else:
+            build_graph(
+                manager,
+                tables,
+                max_workers=BUILD_WORKERS,
+                review_chunksize=int(REVIEW_CHUNKSIZE) if REVIEW_CHUNKSIZE else None,
+            )
+        manager.stamp_graph_version()
 
     finally:
         manager.close()
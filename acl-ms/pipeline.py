@@ -0,0 +1,156 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List
+
+
+class BuildStep:
+    def __init__(self, name: str, func: Callable[[], None], depends_on: List[str]):
+        self.name = name
+        self.func = func
+        self.depends_on = depends_on
+        self.started_at = None
+        self.finished_at = None
+
+    @property
+    def elapsed(self) -> float:
+        return self.finished_at - self.started_at
+
+
+class BuildScheduler:
+    """Runs graph build steps as a DAG, independent steps in parallel.
+
+    Every step runs on its own worker thread; the Neo4j driver is thread safe
+    and each manager call opens its own session, so steps never share one.
+    """
+
+    def __init__(self, max_workers: int = 4):
+        self.max_workers = max_workers
+        self.steps: Dict[str, BuildStep] = {}
+
+    def add_step(
+        self, name: str, func: Callable[[], None], depends_on: List[str] = None
+    ):
+        if name in self.steps:
+            raise ValueError(f"Duplicate build step '{name}'")
+        self.steps[name] = BuildStep(name, func, depends_on or [])
+
+    def _validate(self):
+        for step in self.steps.values():
+            for dependency in step.depends_on:
+                if dependency not in self.steps:
+                    raise ValueError(
+                        f"Step '{step.name}' depends on unknown step '{dependency}'"
+                    )
+
+        # Kahn's algorithm, anything left over sits on a cycle
+        remaining = {name: set(step.depends_on) for name, step in self.steps.items()}
+        while remaining:
+            ready = [name for name, deps in remaining.items() if not deps]
+            if not ready:
+                raise ValueError(f"Dependency cycle between steps {sorted(remaining)}")
+            for name in ready:
+                del remaining[name]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+
+    def run(self):
+        self._validate()
+
+        pending = dict(self.steps)
+        done = set()
+        running = {}
+        error = None
+        self.started_at = time.time()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while (pending and error is None) or running:
+                if error is None:
+                    ready = [
+                        step
+                        for step in pending.values()
+                        if all(dependency in done for dependency in step.depends_on)
+                    ]
+                    for step in ready:
+                        del pending[step.name]
+                        running[executor.submit(self._run_step, step)] = step
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    step = running.pop(future)
+                    try:
+                        future.result()
+                        done.add(step.name)
+                    except Exception as e:
+                        print(f"Build step '{step.name}' failed: {e}")
+                        error = error or e
+
+        self.finished_at = time.time()
+        self.print_report()
+
+        if error is not None:
+            raise error
+
+    def _run_step(self, step: BuildStep):
+        step.started_at = time.time()
+        try:
+            step.func()
+        finally:
+            step.finished_at = time.time()
+
+    def _critical_path(self) -> List[BuildStep]:
+        # longest chain of dependent steps by measured duration
+        memo = {}
+
+        def chain(name):
+            if name not in memo:
+                step = self.steps[name]
+                longest = max(
+                    (chain(dependency) for dependency in step.depends_on),
+                    key=lambda path: sum(s.elapsed for s in path),
+                    default=[],
+                )
+                memo[name] = longest + [step]
+            return memo[name]
+
+        finished = [s.name for s in self.steps.values() if s.finished_at is not None]
+        if any(
+            dependency not in finished
+            for name in finished
+            for dependency in self.steps[name].depends_on
+        ):
+            return []
+        return max(
+            (chain(name) for name in finished),
+            key=lambda path: sum(s.elapsed for s in path),
+            default=[],
+        )
+
+    def print_report(self):
+        print("=" * 60)
+        print("Graph build timing report")
+        print("=" * 60)
+
+        finished = sorted(
+            (s for s in self.steps.values() if s.finished_at is not None),
+            key=lambda s: s.started_at,
+        )
+        for step in finished:
+            offset = step.started_at - self.started_at
+            print(f"  {step.name:<30} start +{offset:7.2f}s  took {step.elapsed:7.2f}s")
+
+        skipped = [s.name for s in self.steps.values() if s.started_at is None]
+        if skipped:
+            print(f"  Not run: {', '.join(skipped)}")
+
+        wall_time = self.finished_at - self.started_at
+        serial_time = sum(s.elapsed for s in finished)
+        print(
+            f"\nWall time: {wall_time:.2f}s (steps run back to back: {serial_time:.2f}s)"
+        )
+
+        critical_path = self._critical_path()
+        if critical_path:
+            path_time = sum(s.elapsed for s in critical_path)
+            names = " -> ".join(s.name for s in critical_path)
+            print(f"Critical path ({path_time:.2f}s): {names}")
+        print("=" * 60)
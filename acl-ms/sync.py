@@ -0,0 +1,290 @@
+import json
+import os
+from typing import Any, Callable, Dict, List
+
+import pandas as pd
+from classes import Neo4jManager
+from tables import TableRegistry
+
+# natural key of every node label, used both to MERGE and to delete
+NODE_KEYS = {
+    "Traveller": "user_id",
+    "Hotel": "hotel_id",
+    "City": "city_name",
+    "Country": "country_name",
+    "Review": "review_id",
+    "Visa": "visa_id",
+}
+
+
+def _relationship_spec(
+    source: Callable[[TableRegistry], pd.DataFrame],
+    from_label: str,
+    from_key: str,
+    from_column: str,
+    to_label: str,
+    to_key: str,
+    to_column: str,
+    relationship_type: str,
+    property_columns: List[str] = None,
+) -> Dict[str, Any]:
+    return {
+        "source": source,
+        "from_label": from_label,
+        "from_key": from_key,
+        "from_column": from_column,
+        "to_label": to_label,
+        "to_key": to_key,
+        "to_column": to_column,
+        "relationship_type": relationship_type,
+        "property_columns": property_columns or [],
+    }
+
+
+RELATIONSHIP_SPECS = {
+    "WROTE": _relationship_spec(
+        lambda tables: tables.reviews,
+        "Traveller",
+        "user_id",
+        "user_id",
+        "Review",
+        "review_id",
+        "review_id",
+        "WROTE",
+    ),
+    "FROM_COUNTRY": _relationship_spec(
+        lambda tables: tables.users,
+        "Traveller",
+        "user_id",
+        "user_id",
+        "Country",
+        "country_name",
+        "country",
+        "FROM_COUNTRY",
+    ),
+    "STAYED_AT": _relationship_spec(
+        lambda tables: tables.stayed_at,
+        "Traveller",
+        "user_id",
+        "user_id",
+        "Hotel",
+        "hotel_id",
+        "hotel_id",
+        "STAYED_AT",
+    ),
+    "REVIEWED": _relationship_spec(
+        lambda tables: tables.reviews,
+        "Review",
+        "review_id",
+        "review_id",
+        "Hotel",
+        "hotel_id",
+        "hotel_id",
+        "REVIEWED",
+    ),
+    "LOCATED_IN (Hotel-City)": _relationship_spec(
+        lambda tables: tables.hotels,
+        "Hotel",
+        "hotel_id",
+        "hotel_id",
+        "City",
+        "city_name",
+        "city",
+        "LOCATED_IN",
+    ),
+    "LOCATED_IN (City-Country)": _relationship_spec(
+        lambda tables: tables.hotels,
+        "City",
+        "city_name",
+        "city",
+        "Country",
+        "country_name",
+        "country",
+        "LOCATED_IN",
+    ),
+    "NEEDS_VISA": _relationship_spec(
+        lambda tables: tables.visa[tables.visa["requires_visa"] == "Yes"],
+        "Country",
+        "country_name",
+        "from",
+        "Country",
+        "country_name",
+        "to",
+        "NEEDS_VISA",
+        property_columns=["visa_type"],
+    ),
+}
+
+
+def _as_id(series: pd.Series) -> pd.Series:
+    # left joins turn integer keys into floats, ids must match the node files
+    if series.dtype.kind == "f":
+        return series.astype("int64")
+    return series
+
+
+def _dedupe(df: pd.DataFrame, key_columns: List[str]) -> pd.DataFrame:
+    df = df.dropna(subset=key_columns).drop_duplicates(subset=key_columns, keep="last")
+    # keys must not depend on whether a join happened to produce NaNs this run
+    return df.assign(**{column: _as_id(df[column]) for column in key_columns})
+
+
+def _row_keys(df: pd.DataFrame, key_columns: List[str]) -> pd.Series:
+    return df[key_columns].astype(str).agg("|".join, axis=1)
+
+
+def fingerprint(df: pd.DataFrame, key_columns: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Map every row's key to its key values and a hash of all its columns."""
+    df = _dedupe(df, key_columns)
+
+    hashes = pd.util.hash_pandas_object(df, index=False).tolist()
+    row_keys = _row_keys(df, key_columns).tolist()
+    key_values = [df[column].tolist() for column in key_columns]
+
+    return {
+        row_key: {
+            "key": [values[i] for values in key_values],
+            "hash": f"{hashes[i]:016x}",
+        }
+        for i, row_key in enumerate(row_keys)
+    }
+
+
+def _select(df: pd.DataFrame, key_columns: List[str], row_keys) -> pd.DataFrame:
+    df = _dedupe(df, key_columns)
+    return df[_row_keys(df, key_columns).isin(set(row_keys))]
+
+
+def diff(
+    previous: Dict[str, Dict[str, Any]], current: Dict[str, Dict[str, Any]]
+) -> Dict[str, List[str]]:
+    inserted = [k for k in current if k not in previous]
+    deleted = [k for k in previous if k not in current]
+    changed = [
+        k
+        for k in current
+        if k in previous and previous[k]["hash"] != current[k]["hash"]
+    ]
+    return {
+        "inserted": inserted,
+        "changed": changed,
+        "deleted": deleted,
+        "unchanged": len(current) - len(inserted) - len(changed),
+    }
+
+
+def load_manifest(manifest_path: str) -> Dict[str, Dict[str, Any]]:
+    if not os.path.exists(manifest_path):
+        return {"nodes": {}, "relationships": {}}
+    with open(manifest_path, "r") as f:
+        return json.load(f)
+
+
+def save_manifest(manifest_path: str, manifest: Dict[str, Dict[str, Any]]):
+    # write to a temp file first so a crash never leaves a half-written manifest
+    tmp_path = f"{manifest_path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f)
+    os.replace(tmp_path, manifest_path)
+
+
+def incremental_sync(
+    manager: Neo4jManager,
+    tables: TableRegistry,
+    node_frames: Dict[str, pd.DataFrame],
+    manifest_path: str,
+):
+    """Push only the rows that changed since the last sync recorded in the manifest."""
+    manifest = load_manifest(manifest_path)
+    new_manifest = {"nodes": {}, "relationships": {}}
+    summary = {}
+    pending_node_deletes = {}
+
+    # upsert nodes first so new relationships can find their endpoints
+    for label, df in node_frames.items():
+        key = NODE_KEYS[label]
+        current = fingerprint(df, [key])
+        changes = diff(manifest["nodes"].get(label, {}), current)
+
+        upserts = changes["inserted"] + changes["changed"]
+        if upserts:
+            manager.create_nodes_from_dataframe(_select(df, [key], upserts), label, key)
+
+        upserted = {current[k]["key"][0] for k in upserts}
+        pending_node_deletes[label] = [
+            value
+            for value in (
+                manifest["nodes"][label][k]["key"][0] for k in changes["deleted"]
+            )
+            # a key recorded with another dtype was just upserted, keep it
+            if value not in upserted
+        ]
+        new_manifest["nodes"][label] = current
+        summary[label] = changes
+
+    for name, spec in RELATIONSHIP_SPECS.items():
+        key_columns = [spec["from_column"], spec["to_column"]]
+        df = spec["source"](tables)[key_columns + spec["property_columns"]]
+        current = fingerprint(df, key_columns)
+        changes = diff(manifest["relationships"].get(name, {}), current)
+
+        upserts = changes["inserted"] + changes["changed"]
+        if upserts:
+            manager.create_relationships_from_dataframe(
+                df=_select(df, key_columns, upserts),
+                from_label=spec["from_label"],
+                from_key=spec["from_key"],
+                from_column=spec["from_column"],
+                to_label=spec["to_label"],
+                to_key=spec["to_key"],
+                to_column=spec["to_column"],
+                relationship_type=spec["relationship_type"],
+                property_columns=spec["property_columns"],
+            )
+
+        upserted = {tuple(current[k]["key"]) for k in upserts}
+        deleted_pairs = [
+            pair
+            for pair in (
+                tuple(manifest["relationships"][name][k]["key"])
+                for k in changes["deleted"]
+            )
+            # Cypher compares 8.0 = 8, deleting this would drop the fresh merge
+            if pair not in upserted
+        ]
+        if deleted_pairs:
+            manager.delete_relationships(
+                spec["from_label"],
+                spec["from_key"],
+                spec["to_label"],
+                spec["to_key"],
+                spec["relationship_type"],
+                deleted_pairs,
+            )
+
+        new_manifest["relationships"][name] = current
+        summary[name] = changes
+
+    # nodes go last, DETACH DELETE also drops whatever edges still point at them
+    for label, values in pending_node_deletes.items():
+        if values:
+            manager.delete_nodes(label, NODE_KEYS[label], values)
+
+    save_manifest(manifest_path, new_manifest)
+    print_diff_summary(summary)
+    return summary
+
+
+def print_diff_summary(summary: Dict[str, Dict[str, Any]]):
+    print("=" * 72)
+    print(
+        f"{'Incremental sync':<30}{'inserted':>10}{'changed':>10}"
+        f"{'deleted':>10}{'unchanged':>12}"
+    )
+    print("=" * 72)
+    for name, changes in summary.items():
+        print(
+            f"{name:<30}{len(changes['inserted']):>10}{len(changes['changed']):>10}"
+            f"{len(changes['deleted']):>10}{changes['unchanged']:>12}"
+        )
+    print("=" * 72)
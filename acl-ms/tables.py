@@ -0,0 +1,132 @@
+import os
+import threading
+from typing import Callable, Dict, Iterator
+
+import pandas as pd
+
+SCORE_DTYPE = "float64"
+
+TABLE_SPECS = {
+    "reviews": {
+        "file": "reviews.csv",
+        "dtype": {
+            "review_id": "int64",
+            "user_id": "int64",
+            "hotel_id": "int64",
+            "review_text": "string",
+            "review_date": "string",
+            "score_overall": SCORE_DTYPE,
+            "score_cleanliness": SCORE_DTYPE,
+            "score_comfort": SCORE_DTYPE,
+            "score_facilities": SCORE_DTYPE,
+            "score_location": SCORE_DTYPE,
+            "score_staff": SCORE_DTYPE,
+            "score_value_for_money": SCORE_DTYPE,
+        },
+    },
+    "users": {
+        "file": "users.csv",
+        "dtype": {
+            "user_id": "int64",
+            "user_gender": "category",
+            "country": "category",
+            "age_group": "category",
+            "traveller_type": "category",
+            "join_date": "string",
+        },
+    },
+    "hotels": {
+        "file": "hotels.csv",
+        "dtype": {
+            "hotel_id": "int64",
+            "hotel_name": "string",
+            "city": "category",
+            "country": "category",
+            "star_rating": "int64",
+            "lat": "float64",
+            "lon": "float64",
+            "cleanliness_base": SCORE_DTYPE,
+            "comfort_base": SCORE_DTYPE,
+            "facilities_base": SCORE_DTYPE,
+            "location_base": SCORE_DTYPE,
+            "staff_base": SCORE_DTYPE,
+            "value_for_money_base": SCORE_DTYPE,
+        },
+    },
+    "visa": {
+        "file": "visa.csv",
+        "dtype": {
+            "from": "category",
+            "to": "category",
+            "requires_visa": "category",
+            "visa_type": "category",
+        },
+    },
+}
+
+
+class TableRegistry:
+    """Parses every source CSV once and shares it between all build steps.
+
+    Build steps run concurrently, so loading is guarded by a lock and the
+    cached frames must be treated as read-only by callers.
+    """
+
+    def __init__(self, data_dir: str = ".."):
+        self.data_dir = data_dir
+        self._tables: Dict[str, pd.DataFrame] = {}
+        self._joins: Dict[str, pd.DataFrame] = {}
+        self._lock = threading.RLock()
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.data_dir, TABLE_SPECS[name]["file"])
+
+    def get(self, name: str) -> pd.DataFrame:
+        with self._lock:
+            if name not in self._tables:
+                self._tables[name] = pd.read_csv(
+                    self.path(name), dtype=TABLE_SPECS[name]["dtype"]
+                )
+                print(f"Loaded table '{name}' ({len(self._tables[name])} rows)")
+            return self._tables[name]
+
+    def iter_chunks(self, name: str, chunksize: int) -> Iterator[pd.DataFrame]:
+        # streamed chunks bypass the cache so memory stays bounded by chunksize
+        with pd.read_csv(
+            self.path(name), dtype=TABLE_SPECS[name]["dtype"], chunksize=chunksize
+        ) as reader:
+            for chunk in reader:
+                yield chunk
+
+    def join(self, name: str, builder: Callable[["TableRegistry"], pd.DataFrame]):
+        with self._lock:
+            if name not in self._joins:
+                self._joins[name] = builder(self)
+            return self._joins[name]
+
+    @property
+    def reviews(self) -> pd.DataFrame:
+        return self.get("reviews")
+
+    @property
+    def users(self) -> pd.DataFrame:
+        return self.get("users")
+
+    @property
+    def hotels(self) -> pd.DataFrame:
+        return self.get("hotels")
+
+    @property
+    def visa(self) -> pd.DataFrame:
+        return self.get("visa")
+
+    @property
+    def stayed_at(self) -> pd.DataFrame:
+        # only the two keys are needed for STAYED_AT, so the join skips the
+        # review and hotel payload columns entirely
+        return self.join(
+            "stayed_at",
+            lambda tables: tables.users[["user_id"]].merge(
+                tables.reviews[["user_id", "hotel_id"]], on="user_id", how="left"
+            ),
+        )
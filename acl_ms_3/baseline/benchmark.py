@@ -0,0 +1,265 @@
+import argparse
+import json
+import random
+import re
+import resource
+import subprocess
+import sys
+import time
+from typing import Callable, List
+
+from acl_ms_3.baseline.intents import intents, match_intents
+
+FILLER = (
+    "please show me some nice hotels for a family trip next month with a pool "
+    "and a moderate price maybe near the old town page two of the results"
+).split()
+
+# realistic prompts, the old and new matchers must agree on every one
+SAMPLE_PROMPTS = [
+    "Show me hotels in Paris with a rating above 8",
+    "hotels with the best reviews in paris",
+    "highest ratings in london",
+    "hotels with high scores",
+    "hotels with cheap prices",
+    "hotels for women aged 25-34",
+    "which hotels have the cleanest rooms",
+    "top rated hotels in cairo",
+    "is a visa required to visit japan",
+    "visa requirements from egypt to france",
+    "Do I need a visa to travel to Egypt?",
+    "hotels with good value for money",
+    "comfortable hotels in rome",
+    "hotels with helpful staff and great service",
+    "what facilities does the hilton have",
+    "female travellers aged 18-24",
+    "hotels with a convenient location",
+    "show me 10 hotels rated above 8.5",
+    "hotels popular with male travellers",
+    "quiet and relaxing hotels",
+    "which city has the best hotels",
+    "hotels with excellent cleanliness scores",
+    "do i need a tourist visa for dubai",
+    "luxurious hotels with spa amenities",
+    "cost of hotels in tokyo",
+]
+
+# prompts where the old scan found a keyword inside an unrelated word, with
+# the intents only that false match produced
+IN_WORD_MATCHES = {
+    "average rating of hotels in berlin": ["demographics"],  # "age" in "average"
+    "hotels with a moderate price": ["rating"],  # "rate" in "moderate"
+    "the second page of results": ["demographics"],  # "age" in "page"
+}
+
+
+def substring_intents(text: str) -> List[str]:
+    """The old matcher: a substring scan per keyword."""
+    matched_intents = []
+    prompt_lower = text.lower()
+    for intent_name, intent_keywords in intents.items():
+        for keyword in intent_keywords:
+            if keyword in prompt_lower:
+                matched_intents.append(intent_name)
+                break
+    return matched_intents
+
+
+def synthetic_prompts(count: int, seed: int = 0) -> List[str]:
+    rng = random.Random(seed)
+    keywords = [keyword for table in intents.values() for keyword in table]
+    prompts = []
+    for _ in range(count):
+        words = rng.choices(FILLER, k=rng.randint(5, 40))
+        for _ in range(rng.randint(0, 3)):
+            words.insert(rng.randrange(len(words) + 1), rng.choice(keywords))
+        prompts.append(" ".join(words))
+    return prompts
+
+
+def location_prompts(count: int, seed: int = 0) -> List[str]:
+    from acl_ms_3.baseline.data import CITIES, COUNTRIES
+
+    rng = random.Random(seed)
+    places = sorted(CITIES | COUNTRIES) or ["paris", "egypt"]
+    prompts = []
+    for prompt in synthetic_prompts(count, seed):
+        words = prompt.split()
+        for _ in range(rng.randint(0, 2)):
+            words.insert(rng.randrange(len(words) + 1), rng.choice(places))
+        prompts.append(" ".join(words))
+    return prompts
+
+
+def _location_child(mode: str, count: int):
+    """Runs in a fresh interpreter so load time and peak RSS belong to one path."""
+    start_time = time.perf_counter()
+    from acl_ms_3.baseline import processor
+
+    if mode == "ner":
+        processor.get_entity_types("warm up")
+    load_time = time.perf_counter() - start_time
+
+    prompts = location_prompts(count)
+    start_time = time.perf_counter()
+    found = [
+        len(processor.Preprocessor(p, use_ner=mode == "ner").entities) for p in prompts
+    ]
+    elapsed_time = time.perf_counter() - start_time
+
+    print(
+        json.dumps(
+            {
+                "load_s": load_time,
+                "us_per_prompt": elapsed_time / len(prompts) * 1e6,
+                # kilobytes on Linux
+                "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+                "locations": sum(found),
+            }
+        )
+    )
+
+
+def benchmark_locations(count: int):
+    print(f"Location extraction, {count} prompts")
+    for mode, label in [("ner", "full NER pipeline"), ("gazetteer", "PhraseMatcher")]:
+        output = subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                __spec__.name,
+                "--location-child",
+                mode,
+                "--prompts",
+                str(count),
+            ],
+            capture_output=True,
+            text=True,
+        )
+        if output.returncode != 0:
+            print(f"  {label:<24} failed: {output.stderr.strip().splitlines()[-1:]}")
+            continue
+        stats = json.loads(output.stdout.strip().splitlines()[-1])
+        print(
+            f"  {label:<24} load {stats['load_s']:6.2f} s  "
+            f"{stats['us_per_prompt']:8.1f} us/prompt  "
+            f"max RSS {stats['max_rss_mb']:7.1f} MB  "
+            f"{stats['locations']} locations"
+        )
+
+
+def benchmark_batch(count: int, batch_size: int, n_process: int, use_ner: bool):
+    from acl_ms_3.baseline.processor import Preprocessor
+
+    prompts = location_prompts(count)
+    path = "NER" if use_ner else "gazetteer"
+    print(f"Batch preprocessing, {count} prompts ({path})")
+
+    def analyse(prompt: str):
+        preprocessor = Preprocessor(prompt, use_ner=use_ner)
+        return preprocessor.map_intents(), preprocessor.get_query_parameters()
+
+    start_time = time.perf_counter()
+    looped = [analyse(prompt) for prompt in prompts]
+    loop_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    batched = [
+        (row["intents"], row["parameters"])
+        for row in Preprocessor.process_many(
+            prompts, batch_size=batch_size, n_process=n_process, use_ner=use_ner
+        )
+    ]
+    batch_time = time.perf_counter() - start_time
+
+    print(f"  per-prompt loop          {count / loop_time:9.0f} prompts/sec")
+    print(
+        f"  process_many             {count / batch_time:9.0f} prompts/sec  "
+        f"(batch_size={batch_size}, n_process={n_process})"
+    )
+    print(f"  speedup: {loop_time / batch_time:.2f}x, identical: {looped == batched}")
+
+
+def _in_word_only(prompt: str, intent_name: str) -> bool:
+    # every occurrence of the intent's keywords starts inside another word
+    prompt_lower = prompt.lower()
+    return not any(
+        re.search(rf"\b{re.escape(keyword)}", prompt_lower)
+        for keyword in intents[intent_name]
+    )
+
+
+def check_agreement(prompts: List[str]) -> int:
+    """The compiled pattern must give the old results, minus in-word matches.
+
+    Returns how many of prompts lost an intent to an in-word match, e.g. the
+    "rate" in "moderate".
+    """
+    for prompt in SAMPLE_PROMPTS:
+        before, after = substring_intents(prompt), match_intents(prompt)
+        assert before == after, f"{prompt!r}: {before} -> {after}"
+    for prompt, false_intents in IN_WORD_MATCHES.items():
+        before, after = substring_intents(prompt), match_intents(prompt)
+        expected = [intent for intent in before if intent not in false_intents]
+        assert after == expected, f"{prompt!r}: {before} -> {after}"
+
+    differing = 0
+    for prompt in prompts:
+        before, after = substring_intents(prompt), match_intents(prompt)
+        dropped = [intent for intent in before if intent not in after]
+        assert set(after) <= set(before), f"{prompt!r}: {before} -> {after}"
+        assert all(
+            _in_word_only(prompt, intent) for intent in dropped
+        ), f"{prompt!r}: {before} -> {after}"
+        differing += bool(dropped)
+    return differing
+
+
+def _time(label: str, prompts: List[str], func: Callable[[str], List[str]]):
+    start_time = time.perf_counter()
+    results = [func(prompt) for prompt in prompts]
+    elapsed_time = time.perf_counter() - start_time
+    print(
+        f"  {label:<24} {elapsed_time * 1000:8.1f} ms  "
+        f"{elapsed_time / len(prompts) * 1e6:7.1f} us/prompt"
+    )
+    return results, elapsed_time
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Prompt preprocessing benchmarks")
+    parser.add_argument("--prompts", type=int, default=5000)
+    parser.add_argument("--only", choices=["intents", "locations", "batch"])
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--n-process", type=int, default=1)
+    parser.add_argument(
+        "--ner", action="store_true", help="batch mode, use the full NER pipeline"
+    )
+    parser.add_argument(
+        "--location-child", choices=["ner", "gazetteer"], help=argparse.SUPPRESS
+    )
+    args = parser.parse_args()
+
+    if args.location_child:
+        _location_child(args.location_child, args.prompts)
+        sys.exit(0)
+    if args.only in (None, "locations"):
+        benchmark_locations(args.prompts)
+    if args.only in (None, "batch"):
+        benchmark_batch(args.prompts, args.batch_size, args.n_process, args.ner)
+    if args.only in ("locations", "batch"):
+        sys.exit(0)
+
+    prompts = synthetic_prompts(args.prompts)
+    print(f"{len(prompts)} prompts, {sum(map(len, intents.values()))} keywords")
+
+    old, old_time = _time("substring scan", prompts, substring_intents)
+    new, new_time = _time("compiled pattern", prompts, match_intents)
+    print(f"  speedup: {old_time / new_time:.2f}x")
+
+    differing = check_agreement(prompts)
+    print(f"  matchers agree on all {len(SAMPLE_PROMPTS)} sample prompts")
+    print(
+        f"  synthetic prompts that only lost in-word matches: "
+        f"{differing}/{len(prompts)}"
+    )
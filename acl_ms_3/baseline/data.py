@@ -1,13 +1,15 @@
 import csv
 import os
-from typing import Set
+from typing import Dict, Set
 
 
-def _load_location_data() -> tuple[Set[str], Set[str]]:
+def _load_location_data() -> tuple[Set[str], Set[str], Dict[str, str]]:
     cities = set()
     countries = set()
+    # lowercase -> casing used in the graph, e.g. "new york" -> "New York"
+    names = {}
 
-    csv_path = os.path.join(os.path.dirname(__file__), "../hotels.csv")
+    csv_path = os.path.join(os.path.dirname(__file__), "../../hotels.csv")
 
     try:
         with open(csv_path, "r", encoding="utf-8") as f:
@@ -15,14 +17,16 @@ def _load_location_data() -> tuple[Set[str], Set[str]]:
             for row in reader:
                 if "city" in row:
                     cities.add(row["city"].lower())
+                    names[row["city"].lower()] = row["city"]
                 if "country" in row:
                     countries.add(row["country"].lower())
+                    names[row["country"].lower()] = row["country"]
     except FileNotFoundError:
         print(f"Warning: {csv_path} not found. Location detection may be limited.")
 
-    return cities, countries
+    return cities, countries, names
 
 
-CITIES, COUNTRIES = _load_location_data()
+CITIES, COUNTRIES, LOCATION_NAMES = _load_location_data()
 
-__all__ = ["CITIES", "COUNTRIES"]
+__all__ = ["CITIES", "COUNTRIES", "LOCATION_NAMES"]
@@ -1,3 +1,6 @@
+import re
+from typing import Dict, List, Set
+
 intents = {
     "rating": [
         "rating",
@@ -149,4 +152,72 @@ intents = {
     ],
 }
 
-__all__ = ["intents"]
+
+# plural, past tense and comparative endings: "reviews", "aged" and "cleanest"
+# still match their keywords the way a plain substring check would
+KEYWORD_SUFFIX = r"(?:s|es|d|ed|er|est)?"
+
+
+def _compile_keywords(table: Dict[str, List[str]]):
+    # prefix closure: a keyword also counts for the intents of every keyword it
+    # starts with, since only the longest keyword at each position is reported
+    keyword_intents: Dict[str, Set[str]] = {}
+    for intent_name, intent_keywords in table.items():
+        for keyword in intent_keywords:
+            keyword_intents.setdefault(keyword.lower(), set()).add(intent_name)
+    for keyword in keyword_intents:
+        for prefix, prefix_intents in list(keyword_intents.items()):
+            if keyword != prefix and re.match(
+                rf"{re.escape(prefix)}{KEYWORD_SUFFIX}\b", keyword
+            ):
+                keyword_intents[keyword] |= prefix_intents
+
+    # only word starts are tried, the lookahead lets overlapping keywords all
+    # match in a single scan
+    pattern = re.compile(rf"\b(?=({_trie_pattern(keyword_intents)}){KEYWORD_SUFFIX}\b)")
+    return pattern, keyword_intents
+
+
+def _trie_pattern(keywords) -> str:
+    """Alternation with shared prefixes factored out, e.g. visa(?: type)?.
+
+    The regex engine then walks each keyword prefix once instead of trying
+    every alternative in turn, and greedy optional tails prefer the longest
+    keyword ("visa type" over "visa") that still ends on a word boundary.
+    """
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node) -> str:
+        branches = [
+            re.escape(char) + build(child) for char, child in node.items() if char
+        ]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+
+_KEYWORD_PATTERN, _KEYWORD_INTENTS = _compile_keywords(intents)
+_INTENT_ORDER = {intent_name: i for i, intent_name in enumerate(intents)}
+
+
+def match_intents(text: str) -> List[str]:
+    """Intents whose keywords start a word of text, in table order.
+
+    A keyword matches as a whole word or followed by a plural, past tense or
+    comparative ending (KEYWORD_SUFFIX), but not inside another word.
+    """
+    matched = set()
+    for keyword in _KEYWORD_PATTERN.findall(text.lower()):
+        matched |= _KEYWORD_INTENTS[keyword]
+    return sorted(matched, key=_INTENT_ORDER.get)
+
+
+__all__ = ["intents", "match_intents"]
@@ -1,23 +1,51 @@
+import itertools
 import re
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, Iterator, List, Optional
 
 import spacy
-from data import CITIES, COUNTRIES
-from intents import intents
+from spacy.matcher import PhraseMatcher
+from spacy.util import filter_spans
 
-try:
-    nlp = spacy.load("en_core_web_sm")
-except OSError:
-    print("Downloading spaCy model 'en_core_web_sm'...")
-    import subprocess
+from acl_ms_3.baseline.data import CITIES, COUNTRIES, LOCATION_NAMES
+from acl_ms_3.baseline.intents import intents, match_intents
 
-    subprocess.run(["python", "-m", "spacy", "download", "en_core_web_sm"])
-    nlp = spacy.load("en_core_web_sm")
+# components en_core_web_sm does not need for named entities
+NER_EXCLUDE = ["tagger", "parser", "senter", "attribute_ruler", "lemmatizer"]
 
 
-def get_entity_types(text: str) -> Dict[str, str]:
-    doc = nlp(text)
+def _load_pipeline(exclude: List[str]):
+    try:
+        return spacy.load("en_core_web_sm", exclude=exclude)
+    except OSError:
+        print("Downloading spaCy model 'en_core_web_sm'...")
+        import subprocess
+
+        subprocess.run(["python", "-m", "spacy", "download", "en_core_web_sm"])
+        return spacy.load("en_core_web_sm", exclude=exclude)
+
+
+# the gazetteer only needs the English tokenizer, en_core_web_sm is loaded
+# (and downloaded if missing) only once get_entity_types is actually called
+nlp = spacy.blank("en")
+_ner_nlp = None
+
+
+def _build_location_matcher() -> PhraseMatcher:
+    matcher = PhraseMatcher(nlp.vocab, attr="LOWER")
+    matcher.add("Location", [nlp.make_doc(name) for name in sorted(CITIES | COUNTRIES)])
+    return matcher
+
+
+location_matcher = _build_location_matcher()
+
+
+def _doc_locations(doc) -> Dict[str, str]:
+    # longest match wins, e.g. "new york" over "york"
+    spans = filter_spans(location_matcher(doc, as_spans=True))
+    return {span.text: "Location" for span in spans}
+
 
+def _doc_entities(doc) -> Dict[str, str]:
     entity_map = {}
 
     for ent in doc.ents:
@@ -28,6 +56,22 @@ def get_entity_types(text: str) -> Dict[str, str]:
     return entity_map
 
 
+def _get_ner_pipeline():
+    global _ner_nlp
+    if _ner_nlp is None:
+        _ner_nlp = _load_pipeline(exclude=NER_EXCLUDE)
+    return _ner_nlp
+
+
+def get_location_entities(text: str) -> Dict[str, str]:
+    """Known cities and countries in text, found by tokenizing and a gazetteer lookup."""
+    return _doc_locations(nlp.make_doc(text))
+
+
+def get_entity_types(text: str) -> Dict[str, str]:
+    return _doc_entities(_get_ner_pipeline()(text))
+
+
 def _map_entity_label(label: str) -> str:
     label_mapping = {"GPE": "Location", "LOC": "Location"}
 
@@ -35,11 +79,60 @@ def _map_entity_label(label: str) -> str:
 
 
 class Preprocessor:
-    def __init__(self, prompt: str):
+    def __init__(
+        self,
+        prompt: str,
+        use_ner: bool = False,
+        entities: Optional[Dict[str, str]] = None,
+    ):
         self.prompt = prompt
-        self.entities = get_entity_types(prompt.lower())
+        # only known cities and countries are ever used, a gazetteer finds
+        # exactly those; use_ner runs the full statistical NER instead
+        if entities is not None:
+            self.entities = entities
+        elif use_ner:
+            self.entities = get_entity_types(prompt.lower())
+        else:
+            self.entities = get_location_entities(prompt.lower())
         self.extracted_values = self._extract_values()
 
+    @classmethod
+    def process_many(
+        cls,
+        prompts: Iterable[str],
+        batch_size: int = 1000,
+        n_process: int = 1,
+        use_ner: bool = False,
+    ) -> Iterator[Dict[str, Any]]:
+        """Intents and query parameters for a stream of prompts, in order.
+
+        With use_ner the prompts go through nlp.pipe in batches, across
+        n_process worker processes when n_process > 1. The gazetteer path has
+        no pipeline components to batch, so it only runs the tokenizer in
+        batches in this process; shipping docs back from workers costs more
+        than tokenizing them.
+        """
+        # the original prompt rides along so the input can be a generator over
+        # a log file, nothing is materialised up front
+        prompts, texts = itertools.tee(prompts)
+        texts = (prompt.lower() for prompt in texts)
+        if use_ner:
+            docs = _get_ner_pipeline().pipe(
+                texts, batch_size=batch_size, n_process=n_process
+            )
+        else:
+            docs = nlp.tokenizer.pipe(texts, batch_size=batch_size)
+        for prompt, doc in zip(prompts, docs):
+            preprocessor = cls(
+                prompt,
+                entities=_doc_entities(doc) if use_ner else _doc_locations(doc),
+            )
+            yield {
+                "prompt": prompt,
+                "intents": preprocessor.map_intents(),
+                "parameters": preprocessor.get_query_parameters(),
+            }
+
     def _extract_values(self) -> Dict[str, Any]:
         """Extract specific values from the prompt for query parameters."""
         values = {}
@@ -54,10 +147,11 @@ class Preprocessor:
                 entity_lower = entity_text.lower()
 
                 # Check if it's a known city or country
+                # the graph stores the names as spelled in hotels.csv
                 if entity_lower in CITIES:
-                    values["city"].append(entity_text.capitalize())
+                    values["city"].append(LOCATION_NAMES[entity_lower])
                 elif entity_lower in COUNTRIES:
-                    values["country"].append(entity_text.capitalize())
+                    values["country"].append(LOCATION_NAMES[entity_lower])
 
         # Extract numbers (for ratings, limits, etc.)
         numbers = re.findall(r"\b\d+(?:\.\d+)?\b", self.prompt)
@@ -92,22 +186,16 @@ class Preprocessor:
         return values
 
     def map_intents(self) -> List[str]:
-        matched_intents = []
-        prompt_lower = self.prompt.lower()
-
-        for intent_name, intent_keywords in intents.items():
-            for keyword in intent_keywords:
-                if keyword in prompt_lower:
-                    if intent_name not in matched_intents:
-                        matched_intents.append(intent_name)
-                    break  # Move to next intent once we find a match
-
-            if intent_name == "location" and self.entities:
-                for entity_type in self.entities.values():
-                    if entity_type == "Location":
-                        if intent_name not in matched_intents:
-                            matched_intents.append(intent_name)
-                        break
+        # one pass of the compiled keyword pattern, whole words only
+        matched_intents = match_intents(self.prompt)
+
+        # a recognised place implies the location intent even without a keyword
+        if "location" not in matched_intents and "Location" in self.entities.values():
+            matched_intents = [
+                intent_name
+                for intent_name in intents
+                if intent_name in matched_intents or intent_name == "location"
+            ]
         return matched_intents
 
     def get_query_parameters(self) -> Dict[str, Any]:
@@ -1,4 +1,5 @@
-from typing import Any, Dict, List, Optional
+import re
+from typing import Any, Dict, List, Optional, Tuple
 
 queries = [
     # Query 1: Hotels by rating and optional location
@@ -27,7 +28,7 @@ queries = [
     },
     # Query 4: Hotels by traveler demographics
     {
-        "query": """MATCH (t:Traveller)-[:STAYED_AT]->(h:Hotel) WHERE ($age_group IS NULL OR t.age_group = $age_group) AND ($gender IS NULL OR t.gender = $gender) RETURN DISTINCT h LIMIT $limit_num""",
+        "query": """MATCH (t:Traveller)-[:STAYED_AT]->(h:Hotel) WHERE ($age_group IS NULL OR t.age = $age_group) AND ($gender IS NULL OR t.gender = $gender) RETURN DISTINCT h LIMIT $limit_num""",
         "intents": {
             "required": ["demographics"],
             "optional": [],
@@ -84,13 +85,52 @@ queries = [
 ]
 
 
+# representative values, so warm-up plans match what requests actually send
+PARAM_SAMPLES = {
+    "limit_num": 10,
+    "rating_num": 8.0,
+    "num": 8.0,
+    "city": ["Paris"],
+    "country": ["France"],
+    "age_group": "25-34",
+    "gender": "Female",
+    "type": "Tourist",
+}
+
+PARAM_DEFAULTS = {
+    "limit_num": 100,
+    "rating_num": None,
+    "num": None,
+    "city": None,
+    "country": None,
+    "age_group": None,
+    "gender": None,
+    "type": None,
+}
+
+
 def find_best_matching_query(
     detected_intents: List[str], parameters: Optional[Dict[str, Any]] = None
-) -> Optional[str]:
+) -> Optional[Tuple[str, Dict[str, Any]]]:
+    """Route intents to a (Cypher template, driver parameters) pair.
+
+    Values are never spliced into the Cypher text, so every request for the
+    same template reuses one cached plan on the server.
+    """
     if parameters is None:
         parameters = {}
 
-    for query_element in queries:
+    template_id = match_query_template(detected_intents)
+    if template_id is None:
+        return None
+
+    # found a matching query, now fill in its parameters
+    return queries[template_id]["query"], query_parameters(template_id, parameters)
+
+
+def match_query_template(detected_intents: List[str]) -> Optional[int]:
+    """Index in queries of the first template the detected intents satisfy."""
+    for template_id, query_element in enumerate(queries):
         required_intents = set(query_element["intents"]["required"])
         optional_intents = set(query_element["intents"]["optional"])
         required_and_optional = required_intents.union(optional_intents)
@@ -104,57 +144,58 @@ def find_best_matching_query(
         if not detected_intents_set.issubset(required_and_optional):
             continue
 
-        # found a matching query, now populate it with parameters
-        query = query_element["query"]
-        populated_query = _populate_query_parameters(query, parameters)
-        return populated_query
+        return template_id
 
     return None
 
 
-def _populate_query_parameters(query: str, parameters: Dict[str, Any]) -> str:
-    populated_query = query
-
-    param_defaults = {
-        "limit_num": 100,
-        "rating_num": None,
-        "num": None,
-        "city": None,
-        "country": None,
-        "age_group": None,
-        "gender": None,
-        "type": None,
-    }
-
-    # merge parameters with defaults
-    final_params = {**param_defaults, **parameters}
-
-    # replace each parameter in the query
-    for param_name, param_value in final_params.items():
-        placeholder = f"${param_name}"
-        if placeholder in populated_query:
-            if param_value is None:
-                # keep as NULL for Cypher query
-                populated_query = populated_query.replace(placeholder, "NULL")
-            elif isinstance(param_value, list):
-                # convert list to Cypher list format: ['item1', 'item2']
-                if param_value:
-                    quoted_items = [f"'{item}'" for item in param_value]
-                    list_str = f"[{', '.join(quoted_items)}]"
-                    populated_query = populated_query.replace(placeholder, list_str)
-                else:
-                    # empty list treated as NULL
-                    populated_query = populated_query.replace(placeholder, "NULL")
-            elif isinstance(param_value, str):
-                # quote string values
-                populated_query = populated_query.replace(
-                    placeholder, f"'{param_value}'"
-                )
-            else:
-                # numeric values don't need quotes
-                populated_query = populated_query.replace(placeholder, str(param_value))
-
-    return populated_query
-
-
-__all__ = ["queries", "find_best_matching_query"]
+def _template_parameters(query: str) -> List[str]:
+    return sorted(set(re.findall(r"\$(\w+)", query)))
+
+
+def query_parameters(template_id: int, parameters: Dict[str, Any]) -> Dict[str, Any]:
+    """Driver parameters for a template: defaults merged in, unused ones dropped."""
+    final_params = {**PARAM_DEFAULTS, **parameters}
+
+    query_params = {}
+    for param_name in _template_parameters(queries[template_id]["query"]):
+        param_value = final_params.get(param_name)
+        if isinstance(param_value, list) and not param_value:
+            # empty list treated as NULL
+            param_value = None
+        query_params[param_name] = param_value
+
+    return query_params
+
+
+def query_cache_key(template_id: int, parameters: Dict[str, Any]) -> Tuple:
+    """Hashable key for a template and the parameters it actually uses."""
+    items = []
+    for param_name, param_value in query_parameters(template_id, parameters).items():
+        if isinstance(param_value, list):
+            # order and duplicates do not change an IN filter
+            param_value = tuple(sorted(set(param_value)))
+        items.append((param_name, param_value))
+
+    return template_id, tuple(items)
+
+
+def warm_up_statements() -> List[Tuple[str, Dict[str, Any]]]:
+    """Every template with default and with representative parameter values."""
+    statements = []
+    for template_id, query_element in enumerate(queries):
+        statements.append((query_element["query"], query_parameters(template_id, {})))
+        statements.append(
+            (query_element["query"], query_parameters(template_id, PARAM_SAMPLES))
+        )
+    return statements
+
+
+__all__ = [
+    "queries",
+    "find_best_matching_query",
+    "match_query_template",
+    "query_parameters",
+    "query_cache_key",
+    "warm_up_statements",
+]
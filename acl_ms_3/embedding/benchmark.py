@@ -0,0 +1,233 @@
+import argparse
+import os
+import random
+import time
+from typing import Callable, List
+
+import numpy as np
+import torch
+
+from acl_ms_3.embedding.embeddor import (
+    BACKENDS,
+    MODEL_NAME,
+    Embeddor,
+    relationship_descriptions,
+)
+from acl_ms_3.embedding.local_index import LocalVectorIndex
+from acl_ms_3.embedding.pool import EmbeddorPool
+from acl_ms_3.shared.database import BATCH_SIZE_CONSTANT
+
+WORDS = (
+    "the room was clean and quiet staff were friendly breakfast could be better "
+    "great location close to the station would stay again bed comfortable view "
+    "noisy at night check in slow pool lovely value for money excellent"
+).split()
+
+
+def synthetic_descriptions(count: int, seed: int = 0) -> List[str]:
+    """Mix of short LOCATED_IN sentences and long review descriptions."""
+    rng = random.Random(seed)
+    scores = {
+        f"score_{name}": round(rng.uniform(5, 10), 1)
+        for name in [
+            "overall",
+            "cleanliness",
+            "comfort",
+            "facilities",
+            "location",
+            "staff",
+            "value_for_money",
+        ]
+    }
+
+    descriptions = []
+    for i in range(count):
+        hotel = {
+            "hotel_name": f"Hotel {i}",
+            "star_rating": rng.randint(3, 5),
+            "average_reviews_score": round(rng.uniform(7, 9.5), 2),
+            "city_name": rng.choice(["Cairo", "Paris", "Tokyo", "London"]),
+        }
+        if rng.random() < 0.5:
+            descriptions.append(relationship_descriptions["LOCATED_IN"].format(**hotel))
+        else:
+            review_text = " ".join(rng.choices(WORDS, k=rng.randint(20, 300)))
+            descriptions.append(
+                relationship_descriptions["REVIEWED"].format(
+                    **hotel, **scores, review_text=review_text
+                )
+            )
+    return descriptions
+
+
+def _time(label: str, count: int, func: Callable[[], np.ndarray]):
+    start_time = time.perf_counter()
+    embeddings = func()
+    elapsed_time = time.perf_counter() - start_time
+    print(f"  {label:<32} {elapsed_time:8.2f}s  {count / elapsed_time:8.1f} texts/sec")
+    return np.asarray(embeddings, dtype=np.float32), elapsed_time
+
+
+def benchmark_batching(embedder: Embeddor, texts: List[str]):
+    print(f"\nFixed batches of {BATCH_SIZE_CONSTANT} vs token-budget buckets")
+
+    def fixed():
+        embeddings = []
+        for i in range(0, len(texts), BATCH_SIZE_CONSTANT):
+            batch = texts[i : i + BATCH_SIZE_CONSTANT]
+            embeddings.extend(embedder.generate_embeddings_batch(batch))
+        return embeddings
+
+    baseline, baseline_time = _time("fixed BATCH_SIZE_CONSTANT", len(texts), fixed)
+    bucketed, bucketed_time = _time(
+        "length-bucketed",
+        len(texts),
+        lambda: embedder.generate_embeddings_bucketed(texts),
+    )
+
+    print(f"  speedup: {baseline_time / bucketed_time:.2f}x")
+    print(f"  max abs difference: {np.abs(baseline - bucketed).max():.2e}")
+
+
+def benchmark_pool(model_name: str, texts: List[str], max_workers: int):
+    print("\nProcess pool scaling, 1 torch thread per worker")
+
+    # single process reference pinned to one thread as well
+    torch.set_num_threads(1)
+    embedder = Embeddor(model_name)
+    reference, reference_time = _time(
+        "single process",
+        len(texts),
+        lambda: embedder.generate_embeddings_batch(texts),
+    )
+
+    workers = 1
+    while workers <= max_workers:
+        pool = EmbeddorPool(
+            workers=workers, threads_per_worker=1, model_name=model_name
+        )
+        try:
+            pool.warm_up()
+            embeddings, elapsed_time = _time(
+                f"{workers} worker(s)",
+                len(texts),
+                lambda: pool.generate_embeddings_batch(texts),
+            )
+        finally:
+            pool.close()
+
+        print(
+            f"    scaling {reference_time / elapsed_time:.2f}x, "
+            f"max abs difference {np.abs(reference - embeddings).max():.2e}"
+        )
+        workers *= 2
+
+
+def benchmark_backends(model_name: str, texts: List[str]):
+    print("\nInference backends vs fp32 torch")
+
+    results = {}
+    for backend in BACKENDS:
+        try:
+            embedder = Embeddor(model_name, backend)
+        except ImportError as e:
+            print(f"  skipping {backend}: {e}")
+            continue
+
+        # query-time latency: one short description at a time
+        start_time = time.perf_counter()
+        for text in texts[:50]:
+            embedder.generate_embeddings_batch([text])
+        latency = (time.perf_counter() - start_time) / min(len(texts), 50) * 1000
+
+        # bulk throughput: the re-embedding path
+        results[backend], _ = _time(
+            f"{backend} (single query {latency:.1f} ms)",
+            len(texts),
+            lambda: embedder.generate_embeddings_bucketed(texts),
+        )
+
+    reference = results["torch"]
+    for backend, embeddings in results.items():
+        if backend == "torch":
+            continue
+        # vectors are L2 normalised, so the row-wise dot product is the cosine
+        cosine = np.sum(reference * embeddings, axis=1)
+        print(
+            f"  {backend} parity: mean cosine {cosine.mean():.5f}, "
+            f"min cosine {cosine.min():.5f}"
+        )
+
+
+def benchmark_local_index(count: int, dimensions: int = 768, queries: int = 200):
+    print(f"\nLocal IVF index vs exact search, {count} vectors")
+
+    # clustered vectors, closer to real description embeddings than pure noise
+    rng = np.random.default_rng(0)
+    centers = rng.normal(size=(32, dimensions)).astype(np.float32)
+    vectors = centers[rng.integers(0, 32, count)] + rng.normal(
+        scale=0.5, size=(count, dimensions)
+    ).astype(np.float32)
+    stars = rng.integers(1, 6, count)
+    cities = rng.choice(["Paris", "Cairo", "New York", "Tokyo"], count)
+
+    index = LocalVectorIndex()
+    index.add(
+        "Hotel",
+        ids=list(range(count)),
+        vectors=vectors,
+        metadata=[
+            {"star_rating": int(s), "city": str(c)} for s, c in zip(stars, cities)
+        ],
+    )
+    index.build()
+
+    normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    query_vectors = vectors[rng.integers(0, count, queries)] + rng.normal(
+        scale=0.1, size=(queries, dimensions)
+    ).astype(np.float32)
+
+    for filters in [None, {"star_rating": 5}, {"city": "New York"}]:
+        start_time = time.perf_counter()
+        for query in query_vectors:
+            index.search("Hotel", query, k=10, filters=filters)
+        elapsed_time = time.perf_counter() - start_time
+
+        recall = 0.0
+        for query in query_vectors:
+            scores = normalized @ (query / np.linalg.norm(query))
+            if filters and "star_rating" in filters:
+                scores[stars != filters["star_rating"]] = -np.inf
+            if filters and "city" in filters:
+                scores[cities != filters["city"]] = -np.inf
+            exact = set(np.argsort(scores)[::-1][:10].tolist())
+            found = index.search("Hotel", query, k=10, filters=filters)
+            recall += len(exact & {hit["id"] for hit in found}) / 10
+
+        print(
+            f"  filters={filters}: {elapsed_time / queries * 1000:.3f} ms/query, "
+            f"recall@10 {recall / queries:.3f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Embeddor CPU benchmarks")
+    parser.add_argument("--texts", type=int, default=1000)
+    parser.add_argument("--model", default=MODEL_NAME)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument(
+        "--only",
+        choices=["batching", "pool", "backends", "index"],
+        help="run a single benchmark",
+    )
+    args = parser.parse_args()
+
+    texts = synthetic_descriptions(args.texts)
+    if args.only in (None, "batching"):
+        benchmark_batching(Embeddor(args.model), texts)
+    if args.only in (None, "pool"):
+        benchmark_pool(args.model, texts, args.workers)
+    if args.only in (None, "backends"):
+        benchmark_backends(args.model, texts)
+    if args.only in (None, "index"):
+        benchmark_local_index(args.texts)
@@ -1,8 +1,16 @@
+import os
 from typing import Any, Dict, List
 
 import numpy as np
 import torch
-from transformers import AutoModel, AutoTokenizer
+from transformers import AutoConfig, AutoModel, AutoTokenizer
+
+MODEL_NAME: str = "Muennighoff/SBERT-base-nli-v2"
+MAX_LENGTH: int = 512
+# padded tokens per forward pass, i.e. batch size x longest text in the batch
+MAX_BATCH_TOKENS: int = 8192
+BACKENDS = ("torch", "int8", "onnx")
+ONNX_DIR: str = os.path.join(os.path.dirname(__file__), "onnx")
 
 node_descriptions = {
     "Traveller": "Traveller is a {age}-year-old {gender} {type} traveller.",
@@ -23,16 +31,123 @@ relationship_descriptions = {
 }
 
 
+class _LastHiddenState(torch.nn.Module):
+    # positional-only wrapper so the exported graph does not depend on the
+    # keyword signature of the transformers forward()
+    def __init__(self, model, input_names: List[str]):
+        super().__init__()
+        self.model = model
+        self.input_names = input_names
+
+    def forward(self, *inputs):
+        return self.model(**dict(zip(self.input_names, inputs)))[0]
+
+
 class Embeddor:
-    def __init__(self):
-        self.tokenizer = AutoTokenizer.from_pretrained("Muennighoff/SBERT-base-nli-v2")
-        self.model = AutoModel.from_pretrained("Muennighoff/SBERT-base-nli-v2")
-        self.model.eval()
+    def __init__(
+        self,
+        model_name: str = MODEL_NAME,
+        backend: str = "torch",
+        dimensions: int = None,
+    ):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend '{backend}', expected one of {BACKENDS}")
+
+        self.model_name = model_name
+        self.backend = backend
+        # keep only the leading dimensions (Matryoshka-style truncation)
+        self.dimensions = dimensions
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        self.hidden_size = AutoConfig.from_pretrained(model_name).hidden_size
+
+        if backend == "torch":
+            # Move to GPU if available
+            self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+        else:
+            # int8 and onnx are CPU-only inference paths
+            self.device = torch.device("cpu")
+
+        if backend == "onnx":
+            # the torch model is only needed to export the graph once
+            self.model = None
+            self.session = self._load_onnx_session()
+        else:
+            self.model = AutoModel.from_pretrained(model_name)
+            self.model.eval()
+            self.model.to(self.device)
 
-        # Move to GPU if available
-        self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-        self.model.to(self.device)
-        print("model loaded successfully✅")
+        if backend == "int8":
+            # dynamic quantization: int8 weights for every Linear layer,
+            # activations quantized on the fly
+            self.model = torch.ao.quantization.quantize_dynamic(
+                self.model, {torch.nn.Linear}, dtype=torch.qint8
+            )
+
+        print(f"model loaded successfully✅ ({backend})")
+
+    @property
+    def embedding_id(self) -> str:
+        # vectors differ between backends and sizes, so caches must not mix them
+        embedding_id = self.model_name
+        if self.backend != "torch":
+            embedding_id += f"#{self.backend}"
+        if self.dimensions:
+            embedding_id += f"@{self.dimensions}"
+        return embedding_id
+
+    def _load_onnx_session(self):
+        try:
+            import onnxruntime
+        except ImportError:
+            raise ImportError(
+                "The onnx backend needs onnxruntime, install it with "
+                "`pip install onnxruntime`"
+            )
+
+        os.makedirs(ONNX_DIR, exist_ok=True)
+        onnx_path = os.path.join(ONNX_DIR, f"{self.model_name.replace('/', '__')}.onnx")
+        if not os.path.exists(onnx_path):
+            self._export_onnx(onnx_path)
+
+        options = onnxruntime.SessionOptions()
+        options.graph_optimization_level = (
+            onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        )
+        session = onnxruntime.InferenceSession(
+            onnx_path, options, providers=["CPUExecutionProvider"]
+        )
+        self.onnx_input_names = [node.name for node in session.get_inputs()]
+        return session
+
+    def _export_onnx(self, onnx_path: str):
+        # loaded just for the export and released afterwards, so the session
+        # never shares memory with a second copy of the weights
+        model = AutoModel.from_pretrained(self.model_name)
+        model.eval()
+
+        dummy = self.tokenizer(["export"], return_tensors="pt")
+        input_names = [
+            name
+            for name in ("input_ids", "attention_mask", "token_type_ids")
+            if name in dummy
+        ]
+        dynamic_axes = {
+            name: {0: "batch", 1: "sequence"}
+            for name in input_names + ["last_hidden_state"]
+        }
+
+        torch.onnx.export(
+            _LastHiddenState(model, input_names),
+            tuple(dummy[name] for name in input_names),
+            onnx_path,
+            input_names=input_names,
+            output_names=["last_hidden_state"],
+            dynamic_axes=dynamic_axes,
+            opset_version=17,
+            dynamo=False,
+        )
+        del model
+        print(f"Exported ONNX graph to {onnx_path}")
 
     def generate_node_description(
         self, node_label: str, node_properties: Dict[str, Any]
@@ -86,31 +201,84 @@ class Embeddor:
             input_mask_expanded.sum(1), min=1e-9
         )
 
-    def generate_embeddings_batch(self, texts: List[str]) -> List[List[float]]:
+    def generate_embeddings_batch(self, texts: List[str]) -> np.ndarray:
         # tokenize all texts
         encoded_input = self.tokenizer(
-            texts, padding=True, truncation=True, max_length=512, return_tensors="pt"
-        ).to(self.device)
+            texts,
+            padding=True,
+            truncation=True,
+            max_length=MAX_LENGTH,
+            return_tensors="pt",
+        )
+        return self._embed_encoded(encoded_input)
+
+    def generate_embeddings_bucketed(
+        self, texts: List[str], max_tokens: int = MAX_BATCH_TOKENS
+    ) -> np.ndarray:
+        if not texts:
+            return np.empty((0, self.get_embedding_dimension()), dtype=np.float32)
+
+        # tokenize once without padding, then group texts of similar length so
+        # short sentences are not padded up to the longest review in the batch
+        input_ids = self.tokenizer(texts, truncation=True, max_length=MAX_LENGTH)[
+            "input_ids"
+        ]
+        order = sorted(range(len(texts)), key=lambda i: len(input_ids[i]))
+
+        batches = []
+        current = []
+        for i in order:
+            # sorted ascending, so the newest text is always the longest one
+            if current and len(input_ids[i]) * (len(current) + 1) > max_tokens:
+                batches.append(current)
+                current = []
+            current.append(i)
+        batches.append(current)
+
+        embeddings = np.empty(
+            (len(texts), self.get_embedding_dimension()), dtype=np.float32
+        )
+        for batch in batches:
+            encoded_input = self.tokenizer.pad(
+                {"input_ids": [input_ids[i] for i in batch]}, return_tensors="pt"
+            )
+            embeddings[batch] = self._embed_encoded(encoded_input)
+
+        return embeddings
+
+    def _embed_encoded(self, encoded_input) -> np.ndarray:
+        encoded_input = encoded_input.to(self.device)
 
         # generate embeddings
-        with torch.no_grad():
-            model_output = self.model(**encoded_input)
+        if self.backend == "onnx":
+            input_ids = encoded_input["input_ids"]
+            inputs = {
+                name: encoded_input.get(name, torch.zeros_like(input_ids)).numpy()
+                for name in self.onnx_input_names
+            }
+            model_output = (torch.from_numpy(self.session.run(None, inputs)[0]),)
+        else:
+            with torch.no_grad():
+                model_output = self.model(**encoded_input)
 
         # perform mean pooling
         sentence_embeddings = self.mean_pooling(
             model_output, encoded_input["attention_mask"]
         )
 
+        if self.dimensions:
+            sentence_embeddings = sentence_embeddings[:, : self.dimensions]
+
         # normalize embeddings
         sentence_embeddings = torch.nn.functional.normalize(
             sentence_embeddings, p=2, dim=1
         )
 
-        # convert to list for JSON serialization
-        return sentence_embeddings.cpu().tolist()
+        # float32 rows, converted to lists only at the Neo4j driver boundary
+        return sentence_embeddings.cpu().numpy().astype(np.float32, copy=False)
 
     def get_embedding_dimension(self) -> int:
-        return self.model.config.hidden_size
+        return self.dimensions or self.hidden_size
 
 
 __all__ = ["Embeddor", "node_descriptions", "relationship_descriptions"]
@@ -0,0 +1,218 @@
+import json
+import math
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+KMEANS_ITERATIONS: int = 10
+DEFAULT_N_PROBE: int = 8
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def _kmeans(vectors: np.ndarray, n_lists: int, seed: int = 0) -> np.ndarray:
+    # spherical k-means: centroids stay unit length so the dot product is cosine
+    rng = np.random.default_rng(seed)
+    centroids = vectors[rng.choice(len(vectors), n_lists, replace=False)].copy()
+    for _ in range(KMEANS_ITERATIONS):
+        assignments = np.argmax(vectors @ centroids.T, axis=1)
+        for i in range(n_lists):
+            members = vectors[assignments == i]
+            if len(members):
+                centroids[i] = members.sum(axis=0)
+        centroids = _normalize(centroids)
+    return centroids
+
+
+class _Namespace:
+    """One label's vectors, grouped by inverted list and stored contiguously."""
+
+    def __init__(
+        self,
+        ids: List[Any],
+        vectors: np.ndarray,
+        centroids: np.ndarray,
+        offsets: np.ndarray,
+        metadata: Dict[str, np.ndarray],
+    ):
+        self.ids = ids
+        self.vectors = vectors
+        self.centroids = centroids
+        # rows offsets[i]:offsets[i + 1] belong to list i
+        self.offsets = offsets
+        self.metadata = metadata
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def mask(self, filters: Dict[str, Any]) -> Optional[np.ndarray]:
+        """Boolean row mask for equality, membership or predicate filters."""
+        if not filters:
+            return None
+
+        mask = np.ones(len(self), dtype=bool)
+        for key, value in filters.items():
+            column = self.metadata.get(key)
+            if column is None:
+                return np.zeros(len(self), dtype=bool)
+            if callable(value):
+                mask &= np.array([bool(value(v)) for v in column], dtype=bool)
+            elif isinstance(value, (list, tuple, set)):
+                mask &= np.isin(column, list(value))
+            else:
+                mask &= column == value
+        return mask
+
+
+class LocalVectorIndex:
+    """In-process IVF index over float32 embeddings, one namespace per label.
+
+    Vectors are clustered with spherical k-means and each search only scans
+    the n_probe closest lists. Saved indexes are plain .npy files that load
+    memory-mapped, so opening one costs almost nothing and pages are read
+    from disk on demand.
+    """
+
+    def __init__(self):
+        self.namespaces: Dict[str, _Namespace] = {}
+        self._pending: Dict[str, Tuple[List[Any], List[np.ndarray], List[dict]]] = {}
+
+    def add(
+        self,
+        namespace: str,
+        ids: List[Any],
+        vectors: np.ndarray,
+        metadata: List[Dict[str, Any]] = None,
+    ):
+        """Stage vectors for a namespace; call build() once everything is added."""
+        pending_ids, pending_vectors, pending_metadata = self._pending.setdefault(
+            namespace, ([], [], [])
+        )
+        pending_ids.extend(ids)
+        pending_vectors.append(_normalize(vectors))
+        pending_metadata.extend(metadata or [{} for _ in ids])
+
+    def build(self, n_lists: int = None):
+        for namespace, (ids, vectors, metadata) in self._pending.items():
+            vectors = np.concatenate(vectors)
+            count = len(vectors)
+            lists = n_lists or max(1, int(math.sqrt(count)))
+            lists = min(lists, count)
+
+            centroids = _kmeans(vectors, lists)
+            assignments = np.argmax(vectors @ centroids.T, axis=1)
+            order = np.argsort(assignments, kind="stable")
+            offsets = np.searchsorted(assignments[order], np.arange(lists + 1))
+
+            keys = sorted({key for row in metadata for key in row})
+            columns = {
+                key: np.array([metadata[i].get(key) for i in order], dtype=object)
+                for key in keys
+            }
+
+            self.namespaces[namespace] = _Namespace(
+                ids=[ids[i] for i in order],
+                vectors=np.ascontiguousarray(vectors[order]),
+                centroids=centroids,
+                offsets=offsets,
+                metadata=columns,
+            )
+            print(f"  Indexed {count} '{namespace}' vectors in {lists} lists")
+        self._pending = {}
+
+    def search(
+        self,
+        namespace: str,
+        query: np.ndarray,
+        k: int = 10,
+        filters: Dict[str, Any] = None,
+        n_probe: int = DEFAULT_N_PROBE,
+    ) -> List[Dict[str, Any]]:
+        """Top-k cosine neighbours of query within a namespace.
+
+        filters maps a metadata key to a value (equality), a list of values
+        (membership) or a callable predicate, e.g. {"star_rating": lambda s: s >= 4}.
+        """
+        space = self.namespaces.get(namespace)
+        if space is None or not len(space):
+            return []
+
+        query = _normalize(query).reshape(-1)
+        mask = space.mask(filters)
+
+        probe = np.argsort(space.centroids @ query)[::-1][:n_probe]
+        rows = np.concatenate(
+            [np.arange(space.offsets[i], space.offsets[i + 1]) for i in probe]
+        )
+        if mask is not None:
+            rows = rows[mask[rows]]
+            # a selective filter can empty the probed lists, scan all matches instead
+            if len(rows) < k:
+                rows = np.flatnonzero(mask)
+
+        if not len(rows):
+            return []
+
+        scores = space.vectors[rows] @ query
+        top = np.argsort(scores)[::-1][:k]
+        return [
+            {
+                "id": space.ids[rows[i]],
+                "score": float(scores[i]),
+                "metadata": {
+                    key: column[rows[i]] for key, column in space.metadata.items()
+                },
+            }
+            for i in top
+        ]
+
+    def save(self, directory: str):
+        for namespace, space in self.namespaces.items():
+            path = os.path.join(directory, namespace)
+            os.makedirs(path, exist_ok=True)
+            np.save(os.path.join(path, "vectors.npy"), space.vectors)
+            np.save(os.path.join(path, "centroids.npy"), space.centroids)
+            np.save(os.path.join(path, "offsets.npy"), space.offsets)
+            with open(os.path.join(path, "metadata.json"), "w") as f:
+                json.dump(
+                    {
+                        "ids": space.ids,
+                        "metadata": {
+                            key: column.tolist()
+                            for key, column in space.metadata.items()
+                        },
+                    },
+                    f,
+                    default=str,
+                )
+        print(f"Saved {len(self.namespaces)} namespaces to {directory}")
+
+    @classmethod
+    def load(cls, directory: str, mmap: bool = True) -> "LocalVectorIndex":
+        index = cls()
+        mmap_mode = "r" if mmap else None
+        for namespace in sorted(os.listdir(directory)):
+            path = os.path.join(directory, namespace)
+            if not os.path.isfile(os.path.join(path, "vectors.npy")):
+                continue
+            with open(os.path.join(path, "metadata.json")) as f:
+                stored = json.load(f)
+            index.namespaces[namespace] = _Namespace(
+                ids=stored["ids"],
+                vectors=np.load(os.path.join(path, "vectors.npy"), mmap_mode=mmap_mode),
+                centroids=np.load(os.path.join(path, "centroids.npy")),
+                offsets=np.load(os.path.join(path, "offsets.npy")),
+                metadata={
+                    key: np.array(values, dtype=object)
+                    for key, values in stored["metadata"].items()
+                },
+            )
+        return index
+
+
+__all__ = ["LocalVectorIndex"]
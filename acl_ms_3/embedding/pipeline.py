@@ -0,0 +1,169 @@
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+import numpy as np
+
+_DONE = object()
+
+
+class StageStats:
+    def __init__(self, name: str):
+        self.name = name
+        self.items = 0
+        self.batches = 0
+        self.busy_time = 0.0
+
+    @property
+    def throughput(self) -> float:
+        return self.items / self.busy_time if self.busy_time > 0 else 0.0
+
+
+class EmbeddingPipeline:
+    """Overlaps reading from Neo4j, model inference and writing back.
+
+    Reading and writing run on background threads connected to the inference
+    stage by bounded queues, so the model keeps working while Neo4j serves the
+    next page and stores the previous batch, and memory stays capped at a few
+    batches in flight.
+    """
+
+    def __init__(
+        self,
+        batches: Iterable[List[Any]],
+        describe: Callable[[Any], Tuple[Any, str]],
+        embed: Callable[[List[str]], np.ndarray],
+        write: Callable[[List[Tuple[Any, np.ndarray]]], int],
+        queue_size: int = 4,
+    ):
+        self.batches = batches
+        self.describe = describe
+        self.embed = embed
+        self.write = write
+
+        self.read_queue = queue.Queue(maxsize=queue_size)
+        self.write_queue = queue.Queue(maxsize=queue_size)
+        self.stats = {
+            "read": StageStats("read"),
+            "infer": StageStats("infer"),
+            "write": StageStats("write"),
+        }
+        self.written = 0
+        self._stop = threading.Event()
+        self._errors = []
+
+    def _put(self, q: queue.Queue, item: Any) -> bool:
+        while not self._stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, q: queue.Queue) -> Any:
+        while not self._stop.is_set():
+            try:
+                return q.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return _DONE
+
+    def _fail(self, error: Exception):
+        self._errors.append(error)
+        self._stop.set()
+
+    def _read(self):
+        stats = self.stats["read"]
+        try:
+            iterator = iter(self.batches)
+            while True:
+                start_time = time.perf_counter()
+                batch = next(iterator, _DONE)
+                stats.busy_time += time.perf_counter() - start_time
+                if batch is _DONE:
+                    break
+                stats.items += len(batch)
+                stats.batches += 1
+                if not self._put(self.read_queue, batch):
+                    return
+        except Exception as e:
+            self._fail(e)
+        finally:
+            self._put(self.read_queue, _DONE)
+
+    def _infer(self):
+        stats = self.stats["infer"]
+        try:
+            while True:
+                batch = self._get(self.read_queue)
+                if batch is _DONE:
+                    break
+
+                start_time = time.perf_counter()
+                ids, descriptions = zip(*(self.describe(item) for item in batch))
+                embeddings = self.embed(list(descriptions))
+                stats.busy_time += time.perf_counter() - start_time
+                stats.items += len(batch)
+                stats.batches += 1
+
+                if not self._put(self.write_queue, list(zip(ids, embeddings))):
+                    return
+        except Exception as e:
+            self._fail(e)
+        finally:
+            self._put(self.write_queue, _DONE)
+
+    def _write(self):
+        stats = self.stats["write"]
+        try:
+            while True:
+                batch = self._get(self.write_queue)
+                if batch is _DONE:
+                    break
+
+                start_time = time.perf_counter()
+                self.written += self.write(batch)
+                stats.busy_time += time.perf_counter() - start_time
+                stats.items += len(batch)
+                stats.batches += 1
+        except Exception as e:
+            self._fail(e)
+
+    def run(self) -> Dict[str, Any]:
+        start_time = time.perf_counter()
+
+        reader = threading.Thread(target=self._read, name="embed-reader", daemon=True)
+        writer = threading.Thread(target=self._write, name="embed-writer", daemon=True)
+        reader.start()
+        writer.start()
+
+        # inference stays on the calling thread, the model is not shared
+        self._infer()
+
+        reader.join()
+        writer.join()
+        elapsed_time = time.perf_counter() - start_time
+
+        if self._errors:
+            raise self._errors[0]
+
+        self.print_report(elapsed_time)
+        return {
+            "read": self.stats["read"].items,
+            "written": self.written,
+            "elapsed_time": elapsed_time,
+        }
+
+    def print_report(self, elapsed_time: float):
+        for stats in self.stats.values():
+            print(
+                f"  {stats.name:<6} {stats.items:>8} items in {stats.batches:>5} batches, "
+                f"busy {stats.busy_time:7.2f}s ({stats.throughput:8.1f} items/sec)"
+            )
+        overall = self.stats["infer"].items / elapsed_time if elapsed_time > 0 else 0.0
+        print(f"  wall   {elapsed_time:7.2f}s ({overall:.1f} items/sec end to end)")
+
+
+__all__ = ["EmbeddingPipeline"]
@@ -0,0 +1,101 @@
+import math
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List
+
+import numpy as np
+import torch
+
+from acl_ms_3.embedding.embeddor import MAX_BATCH_TOKENS, MODEL_NAME, Embeddor
+
+# one model per worker process, loaded by the pool initializer
+_worker_embedder = None
+
+
+def _init_worker(
+    model_name: str, backend: str, dimensions: int, threads_per_worker: int
+):
+    global _worker_embedder
+
+    # pin intra-op threads so N workers do not oversubscribe the cores
+    torch.set_num_threads(threads_per_worker)
+    torch.set_num_interop_threads(1)
+    _worker_embedder = Embeddor(model_name, backend, dimensions)
+
+
+def _embed_shard(texts: List[str]) -> np.ndarray:
+    return _worker_embedder.generate_embeddings_batch(texts)
+
+
+def _embed_shard_bucketed(texts: List[str], max_tokens: int) -> np.ndarray:
+    return _worker_embedder.generate_embeddings_bucketed(texts, max_tokens)
+
+
+class EmbeddorPool:
+    """Shards embedding batches across CPU worker processes.
+
+    Each worker loads the model once and runs with a fixed number of torch
+    threads. Results come back in input order, so the pool is a drop-in for
+    Embeddor.generate_embeddings_batch / generate_embeddings_bucketed.
+    """
+
+    def __init__(
+        self,
+        workers: int = None,
+        threads_per_worker: int = 1,
+        model_name: str = MODEL_NAME,
+        backend: str = "torch",
+        dimensions: int = None,
+    ):
+        self.workers = workers or max(1, (os.cpu_count() or 1) // threads_per_worker)
+        self.threads_per_worker = threads_per_worker
+        self.model_name = model_name
+        self.backend = backend
+        self.dimensions = dimensions
+
+        # spawn, not fork: forking a process that already holds torch threads
+        # can deadlock the children
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(model_name, backend, dimensions, threads_per_worker),
+        )
+
+    def close(self):
+        self.executor.shutdown()
+
+    def _shards(self, texts: List[str]) -> List[List[str]]:
+        size = math.ceil(len(texts) / self.workers)
+        return [texts[i : i + size] for i in range(0, len(texts), size)]
+
+    def generate_embeddings_batch(self, texts: List[str]) -> np.ndarray:
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+
+        return np.concatenate(
+            list(self.executor.map(_embed_shard, self._shards(texts)))
+        )
+
+    def generate_embeddings_bucketed(
+        self, texts: List[str], max_tokens: int = MAX_BATCH_TOKENS
+    ) -> np.ndarray:
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+
+        shards = self._shards(texts)
+        return np.concatenate(
+            list(
+                self.executor.map(
+                    _embed_shard_bucketed, shards, [max_tokens] * len(shards)
+                )
+            )
+        )
+
+    def warm_up(self):
+        # make every worker load its model before timing anything
+        self.generate_embeddings_batch(["warm up"] * self.workers)
+
+
+__all__ = ["EmbeddorPool"]
@@ -0,0 +1,51 @@
+from typing import Any, Dict, Generator, List, Optional
+
+from acl_ms_3.baseline.queries import (
+    match_query_template,
+    queries,
+    query_cache_key,
+    query_parameters,
+)
+from acl_ms_3.shared.database import Step
+from acl_ms_3.shared.result_cache import QueryResultCache
+
+
+def answer_steps(
+    detected_intents: List[str],
+    parameters: Dict[str, Any],
+    result_cache: Optional[QueryResultCache] = None,
+) -> Generator[Step, Any, Dict[str, Any]]:
+    """Route intents to a template and answer it, through the result cache.
+
+    The flow is shared by the Flask and the asyncio service: it yields every
+    database call it needs as a step and never does I/O itself, so the same
+    routing and caching run on either connection through run_steps or
+    run_steps_async.
+    """
+    template_id = match_query_template(detected_intents)
+    if template_id is None:
+        return {
+            "success": False,
+            "intents": detected_intents,
+            "error": "No query matches the detected intents",
+        }
+
+    if result_cache is not None and result_cache.version_due():
+        result_cache.observe_version((yield ("get_graph_version", ())))
+
+    key = query_cache_key(template_id, parameters)
+    results = result_cache.get(key) if result_cache is not None else None
+    if results is None:
+        # the version before querying, a newer one observed meanwhile wins
+        version = result_cache.graph_version if result_cache is not None else None
+        results = yield (
+            "execute_query",
+            (queries[template_id]["query"], query_parameters(template_id, parameters)),
+        )
+        if result_cache is not None:
+            result_cache.put(key, results, version)
+
+    return {"success": True, "intents": detected_intents, "results": results}
+
+
+__all__ = ["answer_steps"]
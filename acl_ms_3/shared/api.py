@@ -1,12 +1,45 @@
+import json
 import os
 
 import requests
 from flask import Flask, jsonify, request
 from flask_cors import CORS
 
+from acl_ms_3.baseline.processor import Preprocessor, nlp
+from acl_ms_3.baseline.queries import warm_up_statements
+from acl_ms_3.shared.answer import answer_steps
+from acl_ms_3.shared.database import Neo4jConnection, run_steps
+from acl_ms_3.shared.result_cache import QueryResultCache
+
 app = Flask(__name__)
 CORS(app)
 
+# created once per worker process: the driver's connection pool is shared by
+# every request thread, and spaCy is warmed up before the first request
+neo4j_conn = Neo4jConnection()
+nlp("warm up")
+neo4j_conn.warm_up_queries(warm_up_statements())
+
+# the graph only changes at load time, repeated questions are served from memory
+result_cache = QueryResultCache.from_config(neo4j_conn.config)
+
+
+def run_prompt(prompt: str) -> dict:
+    preprocessor = Preprocessor(prompt)
+    response = run_steps(
+        neo4j_conn,
+        answer_steps(
+            preprocessor.map_intents(),
+            preprocessor.get_query_parameters(),
+            result_cache,
+        ),
+    )
+    if response["success"]:
+        response["llm_response"] = json.dumps(
+            response["results"], indent=2, default=str
+        )
+    return response
+
 
 @app.route("/health", methods=["GET"])
 def health_check():
@@ -14,8 +47,32 @@ def health_check():
     return jsonify({"status": "healthy", "service": "ACL Hotels Query API"}), 200
 
 
+@app.route("/api/cache", methods=["GET"])
+def cache_stats():
+    """Result cache hit/miss metrics."""
+    return jsonify(result_cache.stats()), 200
+
+
+@app.route("/api/query", methods=["POST"])
+def query():
+    """Answer a natural language prompt from the graph."""
+    prompt = (request.get_json(silent=True) or {}).get("prompt", "").strip()
+    if not prompt:
+        return jsonify({"success": False, "error": "Missing 'prompt'"}), 400
+
+    try:
+        response = run_prompt(prompt)
+    except Exception as e:
+        print(f"Error answering prompt '{prompt}': {e}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
+    return jsonify(response), 200 if response["success"] else 422
+
+
 if __name__ == "__main__":
+    # development server only, production runs under gunicorn:
+    #   gunicorn -c acl_ms_3/shared/gunicorn.conf.py acl_ms_3.shared.api:app
     try:
-        app.run(host="0.0.0.0", port=5000, debug=True)
+        app.run(host="0.0.0.0", port=int(os.environ.get("PORT", 5000)), debug=True)
     finally:
         neo4j_conn.close()
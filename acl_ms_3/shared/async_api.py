@@ -0,0 +1,106 @@
+import json
+from typing import Any, Dict, Tuple
+
+from acl_ms_3.baseline.queries import warm_up_statements
+from acl_ms_3.shared.async_database import AsyncNeo4jConnection
+from acl_ms_3.shared.result_cache import QueryResultCache
+
+# uvicorn acl_ms_3.shared.async_api:app --host 0.0.0.0 --port 5000 --workers 4
+
+# same routes and CORS policy as the Flask app, without a framework in between
+CORS_HEADERS = [
+    (b"access-control-allow-origin", b"*"),
+    (b"access-control-allow-headers", b"content-type"),
+    (b"access-control-allow-methods", b"GET, POST, OPTIONS"),
+]
+
+# created on startup, inside the worker's event loop
+neo4j_conn: AsyncNeo4jConnection = None
+result_cache: QueryResultCache = None
+
+
+async def _send_json(send, status: int, body: Dict[str, Any]):
+    payload = json.dumps(body, default=str).encode("utf-8")
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(payload)).encode()),
+                *CORS_HEADERS,
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": payload})
+
+
+async def _read_body(receive) -> bytes:
+    body = b""
+    while True:
+        message = await receive()
+        body += message.get("body", b"")
+        if not message.get("more_body"):
+            return body
+
+
+async def _lifespan(receive, send):
+    global neo4j_conn, result_cache
+
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            neo4j_conn = AsyncNeo4jConnection()
+            result_cache = QueryResultCache.from_config(neo4j_conn.config)
+            await neo4j_conn.warm_up()
+            await neo4j_conn.warm_up_queries(warm_up_statements())
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            await neo4j_conn.close()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def query(body: bytes) -> Tuple[int, Dict[str, Any]]:
+    """Answer a natural language prompt from the graph."""
+    try:
+        prompt = (json.loads(body or b"{}").get("prompt") or "").strip()
+    except (ValueError, AttributeError):
+        prompt = ""
+    if not prompt:
+        return 400, {"success": False, "error": "Missing 'prompt'"}
+
+    try:
+        response = await neo4j_conn.answer_prompt(prompt, result_cache)
+    except Exception as e:
+        print(f"Error answering prompt '{prompt}': {e}")
+        return 500, {"success": False, "error": str(e)}
+
+    if not response["success"]:
+        return 422, response
+    response["llm_response"] = json.dumps(response["results"], indent=2, default=str)
+    return 200, response
+
+
+async def app(scope, receive, send):
+    if scope["type"] == "lifespan":
+        await _lifespan(receive, send)
+        return
+
+    method, path = scope["method"], scope["path"]
+    if method == "OPTIONS":
+        await send(
+            {"type": "http.response.start", "status": 204, "headers": CORS_HEADERS}
+        )
+        await send({"type": "http.response.body", "body": b""})
+    elif method == "GET" and path == "/health":
+        await _send_json(
+            send, 200, {"status": "healthy", "service": "ACL Hotels Query API"}
+        )
+    elif method == "GET" and path == "/api/cache":
+        await _send_json(send, 200, result_cache.stats())
+    elif method == "POST" and path == "/api/query":
+        status, body = await query(await _read_body(receive))
+        await _send_json(send, status, body)
+    else:
+        await _send_json(send, 404, {"success": False, "error": "Not found"})
@@ -0,0 +1,124 @@
+import asyncio
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from neo4j import AsyncGraphDatabase
+
+from acl_ms_3.shared.answer import answer_steps
+from acl_ms_3.shared.database import (
+    GRAPH_VERSION_QUERY,
+    VECTOR_SEARCH_QUERY,
+    driver_options,
+    load_config,
+    load_embedder,
+    record_to_dict,
+    run_steps_async,
+    warm_up_steps,
+)
+from acl_ms_3.shared.result_cache import QueryResultCache
+
+# requests only hold a connection while their query runs, so one event loop
+# can keep far more of them in flight than a thread per request allows
+ASYNC_POOL_SIZE: int = 100
+
+
+def preprocess_prompt(prompt: str) -> Tuple[List[str], Dict[str, Any]]:
+    """spaCy work for one prompt; module level so a process pool can run it."""
+    from acl_ms_3.baseline.processor import Preprocessor
+
+    preprocessor = Preprocessor(prompt)
+    return preprocessor.map_intents(), preprocessor.get_query_parameters()
+
+
+class AsyncNeo4jConnection:
+    """asyncio counterpart of Neo4jConnection for the query service.
+
+    Every request shares one async driver. spaCy and the embedding model are
+    CPU bound, so they run on executors and never block the event loop; pass a
+    ProcessPoolExecutor as executor to take preprocessing off the GIL too.
+    """
+
+    def __init__(self, executor: Executor = None):
+        self.config = load_config()
+        self.driver = AsyncGraphDatabase.driver(
+            **driver_options(self.config, pool_size=ASYNC_POOL_SIZE)
+        )
+        self.database = self.config.get("DATABASE")
+
+        self.executor = executor or ThreadPoolExecutor(
+            max_workers=int(self.config.get("ASYNC_EXECUTOR_WORKERS", 4)),
+            thread_name_prefix="preprocess",
+        )
+        # torch already parallelises a forward pass, one model thread is enough
+        self._model_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="embed"
+        )
+        self._embedder = None
+        self._embedder_lock = threading.Lock()
+
+    async def close(self):
+        await self.driver.close()
+        self.executor.shutdown(wait=False)
+        self._model_executor.shutdown(wait=False)
+
+    async def warm_up(self):
+        # load spaCy on the executor before the first request needs it
+        await self._run(self.executor, preprocess_prompt, "warm up")
+
+    async def _run(self, executor: Executor, func: Callable, *args) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, func, *args)
+
+    async def execute_query(
+        self, query: str, parameters: Dict[str, Any] = None
+    ) -> List[Dict[str, Any]]:
+        async with self.driver.session(database=self.database) as session:
+            result = await session.run(query, parameters)
+            return [record_to_dict(record) async for record in result]
+
+    async def warm_up_queries(
+        self, statements: List[Tuple[str, Dict[str, Any]]]
+    ) -> int:
+        return await run_steps_async(self, warm_up_steps(statements))
+
+    async def get_graph_version(self) -> Optional[str]:
+        result = await self.execute_query(GRAPH_VERSION_QUERY)
+        return result[0]["version"] if result else None
+
+    async def answer_prompt(
+        self, prompt: str, result_cache: QueryResultCache = None
+    ) -> Dict[str, Any]:
+        """Async version of the baseline router: intents -> template -> Neo4j."""
+        detected_intents, parameters = await self._run(
+            self.executor, preprocess_prompt, prompt
+        )
+        return await run_steps_async(
+            self, answer_steps(detected_intents, parameters, result_cache)
+        )
+
+    def _embed(self, text: str):
+        with self._embedder_lock:
+            if self._embedder is None:
+                self._embedder = load_embedder(self.config)
+        return self._embedder.generate_embeddings_batch([text])[0]
+
+    async def vector_search(
+        self, label: str, query_text: str, k: int = 10
+    ) -> List[Dict[str, Any]]:
+        embedding = await self._run(self._model_executor, self._embed, query_text)
+        result = await self.execute_query(
+            VECTOR_SEARCH_QUERY,
+            {
+                "alias": f"node_embeddings_{label}",
+                "k": k,
+                "embedding": embedding.tolist(),
+            },
+        )
+        return [
+            {"properties": dict(record["properties"]), "score": record["score"]}
+            for record in result
+        ]
+
+
+__all__ = ["AsyncNeo4jConnection", "preprocess_prompt"]
@@ -0,0 +1,124 @@
+import argparse
+import csv
+import os
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List
+
+import requests
+
+PROMPTS = [
+    "Show me hotels in Paris with a rating above 8",
+    "Which hotels in Japan are excellent?",
+    "Top 5 hotels in London",
+    "Do I need a visa to travel to Egypt?",
+    "Hotels with great cleanliness",
+    "Best value for money hotels",
+    "Hotels with a good location score",
+    "Hotels with comfortable rooms rated 9",
+    "Hotels with the best facilities",
+    "Hotels with friendly staff",
+]
+
+
+class StandInConnection:
+    """Answers every query after a fixed delay with real hotel rows.
+
+    Stands in for Neo4jConnection so the API's own overhead can be measured
+    without a database; latency_ms models the network and query time.
+    """
+
+    def __init__(self, latency_ms: float = 2.0, rows: int = 25):
+        csv_path = os.path.join(os.path.dirname(__file__), "../../hotels.csv")
+        with open(csv_path, "r", encoding="utf-8") as f:
+            hotels = list(csv.DictReader(f))
+        self.records = [{"h": hotel} for hotel in hotels[:rows]]
+        self.latency_ms = latency_ms
+
+    def execute_query(
+        self, query: str, parameters: Dict[str, Any] = None
+    ) -> List[Dict[str, Any]]:
+        time.sleep(self.latency_ms / 1000)
+        return self.records
+
+    def get_graph_version(self) -> str:
+        return "stand-in"
+
+    def close(self):
+        pass
+
+
+def percentile(values: List[float], q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q / 100 * (len(values) - 1))))]
+
+
+def measure(send: Callable[[str], int], requests_count: int, concurrency: int):
+    def timed(i: int):
+        start_time = time.perf_counter()
+        status = send(PROMPTS[i % len(PROMPTS)])
+        return (time.perf_counter() - start_time) * 1000, status
+
+    start_time = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(timed, range(requests_count)))
+    elapsed_time = time.perf_counter() - start_time
+
+    latencies = [latency for latency, _ in results]
+    errors = sum(1 for _, status in results if status >= 500)
+    print(f"  requests:   {requests_count} ({concurrency} concurrent, {errors} errors)")
+    print(f"  throughput: {requests_count / elapsed_time:8.1f} req/sec")
+    print(f"  p50:        {statistics.median(latencies):8.2f} ms")
+    print(f"  p99:        {percentile(latencies, 99):8.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="/api/query latency benchmark")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument(
+        "--url", help="benchmark a running server, e.g. http://localhost:5000"
+    )
+    parser.add_argument(
+        "--neo4j",
+        action="store_true",
+        help="in-process against the configured Neo4j instead of the stand-in",
+    )
+    parser.add_argument("--stand-in-latency-ms", type=float, default=2.0)
+    parser.add_argument(
+        "--no-cache", action="store_true", help="in-process, bypass the result cache"
+    )
+    args = parser.parse_args()
+
+    if args.url:
+        session = requests.Session()
+
+        def send(prompt: str) -> int:
+            response = session.post(f"{args.url}/api/query", json={"prompt": prompt})
+            return response.status_code
+
+        print(f"POST {args.url}/api/query")
+    else:
+        from acl_ms_3.shared import api
+
+        if not args.neo4j:
+            api.neo4j_conn.close()
+            api.neo4j_conn = StandInConnection(args.stand_in_latency_ms)
+        if args.no_cache:
+            # every entry is evicted as soon as it is stored
+            api.result_cache.max_entries = 0
+        client = api.app.test_client()
+
+        def send(prompt: str) -> int:
+            return client.post("/api/query", json={"prompt": prompt}).status_code
+
+        backend = "Neo4j" if args.neo4j else f"stand-in ({args.stand_in_latency_ms} ms)"
+        print(f"In-process /api/query against {backend}")
+
+    # first requests pay for lazy imports and connection setup
+    for prompt in PROMPTS:
+        send(prompt)
+    measure(send, args.requests, args.concurrency)
+    if not args.url:
+        print(f"  cache:      {api.result_cache.stats()}")
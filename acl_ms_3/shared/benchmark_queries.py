@@ -0,0 +1,123 @@
+import argparse
+import random
+import statistics
+import time
+from typing import Any, Dict, List, Tuple
+
+from acl_ms_3.baseline.data import CITIES, LOCATION_NAMES
+from acl_ms_3.baseline.queries import (
+    PARAM_DEFAULTS,
+    find_best_matching_query,
+    warm_up_statements,
+)
+
+# (detected intents, parameter builder) pairs covering the routed templates
+WORKLOAD = [
+    (
+        ["rating", "location"],
+        lambda rng, city: {
+            "city": [city],
+            "rating_num": rng.choice([7.0, 7.5, 8.0, 8.5, 9.0]),
+            "limit_num": rng.choice([5, 10, 20, 100]),
+        },
+    ),
+    (
+        ["location"],
+        lambda rng, city: {"city": [city], "limit_num": rng.choice([5, 10, 100])},
+    ),
+    (
+        ["cleanliness"],
+        lambda rng, city: {"num": rng.choice([7.0, 8.0, 8.5, 9.0]), "limit_num": 10},
+    ),
+    (
+        ["staff"],
+        lambda rng, city: {"num": rng.choice([7.0, 8.0, 9.0]), "limit_num": 10},
+    ),
+]
+
+
+def splice_parameters(query: str, parameters: Dict[str, Any]) -> str:
+    """The old router: values pasted into the Cypher text with str.replace."""
+    for param_name, param_value in {**PARAM_DEFAULTS, **parameters}.items():
+        placeholder = f"${param_name}"
+        if param_value is None or param_value == []:
+            literal = "NULL"
+        elif isinstance(param_value, list):
+            quoted_items = [f"'{item}'" for item in param_value]
+            literal = f"[{', '.join(quoted_items)}]"
+        elif isinstance(param_value, str):
+            literal = f"'{param_value}'"
+        else:
+            literal = str(param_value)
+        query = query.replace(placeholder, literal)
+    return query
+
+
+def routed_workload(count: int, seed: int = 0) -> List[Tuple[str, Dict[str, Any]]]:
+    rng = random.Random(seed)
+    cities = sorted(LOCATION_NAMES[city] for city in CITIES) or ["Paris", "Cairo"]
+    statements = []
+    for _ in range(count):
+        intents, build = rng.choice(WORKLOAD)
+        statements.append(
+            find_best_matching_query(intents, build(rng, rng.choice(cities)))
+        )
+    return statements
+
+
+def plan_reuse(texts: List[str]) -> float:
+    # every distinct text has to be planned once, everything else can hit the cache
+    return 1 - len(set(texts)) / len(texts)
+
+
+def time_statements(conn, statements: List[Tuple[str, Dict[str, Any]]]) -> List[float]:
+    latencies = []
+    for query, parameters in statements:
+        start_time = time.perf_counter()
+        conn.execute_query(query, parameters)
+        latencies.append((time.perf_counter() - start_time) * 1000)
+    return latencies
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Spliced vs parameterised routed queries"
+    )
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument(
+        "--neo4j",
+        action="store_true",
+        help="also time both modes on the configured Neo4j",
+    )
+    args = parser.parse_args()
+
+    statements = routed_workload(args.queries)
+    spliced = [(splice_parameters(query, params), None) for query, params in statements]
+
+    print(f"{args.queries} routed queries")
+    print(
+        f"  spliced:       {len({q for q, _ in spliced}):5} distinct statements, "
+        f"plan cache hit rate at most {plan_reuse([q for q, _ in spliced]):.1%}"
+    )
+    print(
+        f"  parameterised: {len({q for q, _ in statements}):5} distinct statements, "
+        f"plan cache hit rate at most {plan_reuse([q for q, _ in statements]):.1%}"
+    )
+
+    if args.neo4j:
+        from acl_ms_3.shared.database import Neo4jConnection
+
+        conn = Neo4jConnection()
+        try:
+            conn.warm_up_queries(warm_up_statements())
+            for label, workload in [
+                ("spliced", spliced),
+                ("parameterised", statements),
+            ]:
+                latencies = time_statements(conn, workload)
+                print(
+                    f"  {label:<14} p50 {statistics.median(latencies):7.2f} ms, "
+                    f"mean {statistics.mean(latencies):7.2f} ms"
+                )
+        finally:
+            conn.close()
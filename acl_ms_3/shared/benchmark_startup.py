@@ -0,0 +1,81 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+
+# modules that must never be pulled in just to run Cypher
+HEAVY_MODULES = ["torch", "transformers", "acl_ms_3.embedding.embeddor"]
+
+# runs in a fresh interpreter so every measurement is a cold start
+_CHILD = """
+import json, resource, sys, time
+
+start = time.perf_counter()
+import acl_ms_3.shared.database as database
+import_ms = (time.perf_counter() - start) * 1000
+
+start = time.perf_counter()
+conn = database.Neo4jConnection()
+connect_ms = (time.perf_counter() - start) * 1000
+conn.close()
+
+print(json.dumps({
+    "import_ms": import_ms,
+    "connect_ms": connect_ms,
+    "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "heavy_modules": [m for m in HEAVY_MODULES if m in sys.modules],
+}))
+"""
+
+
+def measure_once() -> dict:
+    code = f"HEAVY_MODULES = {HEAVY_MODULES!r}\n{_CHILD}"
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Cold start import/startup benchmark for acl_ms_3.shared"
+    )
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-import-ms", type=float, default=1500)
+    parser.add_argument("--max-rss-mb", type=float, default=150)
+    args = parser.parse_args()
+
+    runs = [measure_once() for _ in range(args.runs)]
+    import_ms = statistics.median(run["import_ms"] for run in runs)
+    connect_ms = statistics.median(run["connect_ms"] for run in runs)
+    max_rss_mb = max(run["max_rss_mb"] for run in runs)
+    heavy_modules = sorted({m for run in runs for m in run["heavy_modules"]})
+
+    print(
+        f"import acl_ms_3.shared.database: {import_ms:8.1f} ms (median of {args.runs})"
+    )
+    print(f"Neo4jConnection():               {connect_ms:8.1f} ms")
+    print(f"peak RSS:                        {max_rss_mb:8.1f} MB")
+    print(f"heavy modules loaded:            {heavy_modules or 'none'}")
+
+    failures = []
+    if import_ms > args.max_import_ms:
+        failures.append(f"import took {import_ms:.1f} ms > {args.max_import_ms} ms")
+    if max_rss_mb > args.max_rss_mb:
+        failures.append(f"peak RSS {max_rss_mb:.1f} MB > {args.max_rss_mb} MB")
+    if heavy_modules:
+        failures.append(f"heavy modules imported at startup: {heavy_modules}")
+
+    for failure in failures:
+        print(f"✗ {failure}")
+    if failures:
+        sys.exit(1)
+    print("✓ startup within budget")
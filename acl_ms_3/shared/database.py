@@ -1,10 +1,12 @@
 import os
 import time
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, Generator, Iterator, List, Optional, Tuple
 
+import numpy as np
 from neo4j import GraphDatabase
+from neo4j.exceptions import DriverError
 
-from acl_ms_3.embedding.embeddor import Embeddor
+from acl_ms_3.embedding.pipeline import EmbeddingPipeline
 
 
 def load_config() -> Dict[str, str]:
@@ -23,37 +25,229 @@ def load_config() -> Dict[str, str]:
 
 DIMENSION_CONSTANT: int = 768
 BATCH_SIZE_CONSTANT: int = 100
+# records the driver pulls from the server per round trip while streaming
+FETCH_SIZE_CONSTANT: int = 5000
+VECTOR_ALIAS_LABEL: str = "VectorIndexAlias"
+# written by the loader after every build or sync
+GRAPH_VERSION_LABEL: str = "GraphVersion"
+# bookkeeping nodes that are never embedded or indexed
+METADATA_LABELS = (VECTOR_ALIAS_LABEL, GRAPH_VERSION_LABEL)
+INDEX_ONLINE_TIMEOUT: int = 600  # seconds
+# alias lookup and search share one round trip, so a switch is never seen half way
+VECTOR_SEARCH_QUERY: str = f"""
+OPTIONAL MATCH (a:{VECTOR_ALIAS_LABEL} {{name: $alias}})
+WITH coalesce(a.index, $alias) as index_name
+CALL db.index.vector.queryNodes(index_name, $k, $embedding)
+YIELD node, score
+RETURN [key IN keys(node) WHERE NOT key STARTS WITH 'embedding'
+        | [key, node[key]]] as properties,
+       score
+"""
+GRAPH_VERSION_QUERY: str = (
+    f"MATCH (v:{GRAPH_VERSION_LABEL}) RETURN v.version as version"
+)
+EMBEDDING_CACHE_PATH: str = os.path.join(
+    os.path.dirname(__file__), "../../embedding_cache.sqlite"
+)
+
+
+def driver_options(config: Dict[str, str], pool_size: int = 20) -> Dict[str, Any]:
+    return {
+        "uri": config.get("URI"),
+        "auth": (config.get("USERNAME"), config.get("PASSWORD")),
+        # one pool per API worker process, shared by its requests;
+        # fail fast instead of queueing a request for a minute
+        "max_connection_pool_size": int(config.get("NEO4J_MAX_POOL_SIZE", pool_size)),
+        "connection_acquisition_timeout": float(
+            config.get("NEO4J_ACQUISITION_TIMEOUT", 5)
+        ),
+        "max_connection_lifetime": int(
+            config.get("NEO4J_MAX_CONNECTION_LIFETIME", 3000)
+        ),
+        "keep_alive": True,
+    }
+
+
+def embedder_options(config: Dict[str, str]) -> Dict[str, Any]:
+    # full size vectors unless EMBEDDING_DIMENSIONS asks for truncation
+    dimensions = config.get("EMBEDDING_DIMENSIONS")
+    return {
+        "backend": config.get("EMBEDDING_BACKEND", "torch"),
+        "dimensions": int(dimensions) if dimensions else None,
+    }
+
+
+def load_embedder(config: Dict[str, str]):
+    from acl_ms_3.embedding.embeddor import Embeddor
+
+    return Embeddor(**embedder_options(config))
+
+
+def record_to_dict(record) -> Dict[str, Any]:
+    # Convert Neo4j record to dictionary
+    record_dict = {}
+    for key in record.keys():
+        value = record[key]
+        # Handle Neo4j node objects
+        if hasattr(value, "__dict__"):
+            record_dict[key] = dict(value)
+        else:
+            record_dict[key] = value
+    return record_dict
+
+
+# (connection method name, arguments) a step generator wants run; the result
+# is sent back in, or the exception it raised is thrown back in
+Step = Tuple[str, tuple]
+
+
+def run_steps(conn, steps: Generator[Step, Any, Any]) -> Any:
+    """Drive a step generator with a blocking connection."""
+    try:
+        method, args = next(steps)
+        while True:
+            try:
+                result = getattr(conn, method)(*args)
+            except Exception as e:
+                method, args = steps.throw(e)
+            else:
+                method, args = steps.send(result)
+    except StopIteration as done:
+        return done.value
+
+
+async def run_steps_async(conn, steps: Generator[Step, Any, Any]) -> Any:
+    """Drive a step generator with an asyncio connection."""
+    try:
+        method, args = next(steps)
+        while True:
+            try:
+                result = await getattr(conn, method)(*args)
+            except Exception as e:
+                method, args = steps.throw(e)
+            else:
+                method, args = steps.send(result)
+    except StopIteration as done:
+        return done.value
+
+
+def warm_up_steps(
+    statements: List[Tuple[str, Dict[str, Any]]],
+) -> Generator[Step, Any, int]:
+    # EXPLAIN plans without executing and leaves the plan in the query cache
+    warmed = 0
+    for query, parameters in statements:
+        try:
+            yield "execute_query", (f"EXPLAIN {query}", parameters)
+            warmed += 1
+        except DriverError as e:
+            # the database is unreachable, requests will plan on first use
+            print(f"Skipping query plan warm-up: {e}")
+            break
+        except Exception as e:
+            print(f"Error warming up query plan: {e}")
+    print(f"Warmed up {warmed}/{len(statements)} query plans")
+    return warmed
 
 
 class Neo4jConnection:
     def __init__(self):
-        config = load_config()
-        self.driver = GraphDatabase.driver(
-            uri=config.get("URI"),
-            auth=(config.get("USERNAME"), config.get("PASSWORD")),
-        )
-        self.embedder = Embeddor()
+        self.config = load_config()
+        self.driver = GraphDatabase.driver(**driver_options(self.config))
+        # naming the database saves a home database lookup on every session
+        self.database = self.config.get("DATABASE")
+
+        # the model and its torch/transformers imports are only loaded the first
+        # time something needs embeddings, plain Cypher callers never pay for them
+        self._embedder = None
+        self._embedding_cache = None
+        self._embedding_pool = None
+
+    @property
+    def embedder(self):
+        if self._embedder is None:
+            self._embedder = load_embedder(self.config)
+        return self._embedder
+
+    @property
+    def embedding_dimensions(self) -> int:
+        # known from config, so index creation never has to load the model
+        return int(self.config.get("EMBEDDING_DIMENSIONS", DIMENSION_CONSTANT))
+
+    @property
+    def embedding_cache(self):
+        if self._embedding_cache is None:
+            from acl_ms_3.embedding.cache import DEFAULT_MAX_BYTES, EmbeddingCache
+
+            self._embedding_cache = EmbeddingCache(
+                self.config.get("EMBEDDING_CACHE_PATH", EMBEDDING_CACHE_PATH),
+                self.embedder.embedding_id,
+                max_bytes=int(
+                    self.config.get("EMBEDDING_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES)
+                ),
+            )
+        return self._embedding_cache
+
+    @property
+    def embedding_pool(self):
+        # bulk embedding can be sharded over worker processes on CPU-only hosts
+        workers = int(self.config.get("EMBEDDING_WORKERS", 1))
+        if self._embedding_pool is None and workers > 1:
+            from acl_ms_3.embedding.pool import EmbeddorPool
+
+            self._embedding_pool = EmbeddorPool(
+                workers=workers,
+                threads_per_worker=int(
+                    self.config.get("EMBEDDING_THREADS_PER_WORKER", 1)
+                ),
+                # the workers load their own model, the parent never needs one
+                **embedder_options(self.config),
+            )
+        return self._embedding_pool
 
     def close(self):
         if self.driver:
             self.driver.close()
+        if self._embedding_cache:
+            self._embedding_cache.close()
+        if self._embedding_pool:
+            self._embedding_pool.close()
+
+    def generate_embeddings(self, descriptions: List[str]) -> np.ndarray:
+        # only descriptions that were never embedded before go through the model
+        cached = self.embedding_cache.get_many(descriptions)
+        missing = [i for i, vector in enumerate(cached) if vector is None]
+
+        if missing:
+            backend = self.embedding_pool or self.embedder
+            new_embeddings = backend.generate_embeddings_bucketed(
+                [descriptions[i] for i in missing]
+            )
+            self.embedding_cache.put_many(
+                [descriptions[i] for i in missing], new_embeddings
+            )
+            for i, embedding in zip(missing, new_embeddings):
+                cached[i] = embedding
+
+        print(
+            f"  Embedding cache: {len(descriptions) - len(missing)} hits, "
+            f"{len(missing)} misses"
+        )
+        return np.stack(cached).astype(np.float32, copy=False)
 
-    def execute_query(self, query: str) -> List[Dict[str, Any]]:
-        with self.driver.session() as session:
-            result = session.run(query)
-            records = []
-            for record in result:
-                # Convert Neo4j record to dictionary
-                record_dict = {}
-                for key in record.keys():
-                    value = record[key]
-                    # Handle Neo4j node objects
-                    if hasattr(value, "__dict__"):
-                        record_dict[key] = dict(value)
-                    else:
-                        record_dict[key] = value
-                records.append(record_dict)
-            return records
+    def execute_query(
+        self, query: str, parameters: Dict[str, Any] = None
+    ) -> List[Dict[str, Any]]:
+        with self.driver.session(database=self.database) as session:
+            result = session.run(query, parameters)
+            return [record_to_dict(record) for record in result]
+
+    def warm_up_queries(self, statements: List[Tuple[str, Dict[str, Any]]]) -> int:
+        return run_steps(self, warm_up_steps(statements))
+
+    def get_graph_version(self) -> Optional[str]:
+        result = self.execute_query(GRAPH_VERSION_QUERY)
+        return result[0]["version"] if result else None
 
     def get_all_node_labels(self) -> List[str]:
         query = "CALL db.labels()"
@@ -69,55 +263,173 @@ class Neo4jConnection:
         print(f"Found {len(rel_types)} relationship types: {rel_types}")
         return rel_types
 
-    def get_relationships_by_type(self, rel_type: str) -> List[Dict[str, Any]]:
+    def get_embedding_properties(self) -> List[str]:
+        # the plain property plus any blue/green versions of it
+        result = self.execute_query("CALL db.propertyKeys()")
+        keys = [
+            record["propertyKey"]
+            for record in result
+            if record["propertyKey"].startswith("embedding")
+        ]
+        return keys or ["embedding"]
+
+    def _blank_embeddings(self) -> str:
+        return ", ".join(f"`{key}`: null" for key in self.get_embedding_properties())
+
+    def _iter_batches(
+        self, query: str, batch_size: int, parameters: Dict[str, Any] = None
+    ) -> Iterator[List[Dict[str, Any]]]:
+        # one streamed result: the server plans and scans once, and the driver
+        # pulls FETCH_SIZE records at a time, so memory stays bounded without
+        # re-running the query for every page
+        with self.driver.session(
+            database=self.database, fetch_size=FETCH_SIZE_CONSTANT
+        ) as session:
+            batch = []
+            for record in session.run(query, parameters):
+                batch.append(record_to_dict(record))
+                if len(batch) == batch_size:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+
+    def iter_nodes_by_label(
+        self, label: str, batch_size: int = BATCH_SIZE_CONSTANT
+    ) -> Iterator[List[Dict[str, Any]]]:
+        # existing embeddings are blanked out, they are never needed for descriptions
+        blank = self._blank_embeddings()
+        query = f"""
+        MATCH (n:{label})
+        RETURN id(n) as node_id,
+               labels(n) as labels,
+               n {{.*, {blank}}} as properties
+        """
+        return self._iter_batches(query, batch_size)
+
+    def iter_relationships_by_type(
+        self, rel_type: str, batch_size: int = BATCH_SIZE_CONSTANT
+    ) -> Iterator[List[Dict[str, Any]]]:
+        blank = self._blank_embeddings()
         query = f"""
         MATCH (start)-[r:{rel_type}]->(end)
-        RETURN id(r) as rel_id, 
+        RETURN id(r) as rel_id,
                type(r) as rel_type,
-               properties(r) as rel_properties,
+               r {{.*, {blank}}} as rel_properties,
                labels(start) as start_labels,
-               properties(start) as start_properties,
+               start {{.*, {blank}}} as start_properties,
                labels(end) as end_labels,
-               properties(end) as end_properties
+               end {{.*, {blank}}} as end_properties
         """
+        return self._iter_batches(query, batch_size)
+
+    def iter_node_embeddings(
+        self,
+        label: str,
+        property: str = "embedding",
+        batch_size: int = BATCH_SIZE_CONSTANT,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        blank = self._blank_embeddings()
+        # hotels and reviews only reach their city and country through
+        # relationships, join them in so local searches can filter on them
+        query = f"""
+        MATCH (n:{label})
+        WHERE n[$property] IS NOT NULL
+        CALL {{
+            WITH n
+            OPTIONAL MATCH (n)-[:REVIEWED|LOCATED_IN*0..2]->(c:City)
+            OPTIONAL MATCH (c)-[:LOCATED_IN]->(co:Country)
+            RETURN c.city_name as city, co.country_name as country
+            LIMIT 1
+        }}
+        RETURN id(n) as node_id,
+               n {{.*, {blank}}} as properties,
+               city,
+               coalesce(country, n.country_name) as country,
+               n[$property] as embedding
+        """
+        return self._iter_batches(query, batch_size, {"property": property})
+
+    @staticmethod
+    def _check_location_filter(index) -> bool:
+        # a city filter on the exported hotels must only return that city
+        hotels = index.namespaces.get("Hotel")
+        if hotels is None or not len(hotels) or "city" not in hotels.metadata:
+            print("  ✗ No Hotel vectors with a city to check the filter on")
+            return False
+
+        city = hotels.metadata["city"][0]
+        hits = index.search("Hotel", hotels.vectors[0], k=5, filters={"city": city})
+        if hits and all(hit["metadata"]["city"] == city for hit in hits):
+            print(f"  ✓ city filter on Hotel: {len(hits)} hits, all in {city}")
+            return True
+        print(f"  ✗ city filter on Hotel did not return only hotels in {city}")
+        return False
+
+    def export_local_index(self, directory: str, labels: List[str] = None):
+        """Copy stored node embeddings into a LocalVectorIndex saved on disk."""
+        from acl_ms_3.embedding.local_index import LocalVectorIndex
+
+        aliases = self.get_vector_aliases("node")
+        labels = labels or [
+            label
+            for label in self.get_all_node_labels()
+            if label not in METADATA_LABELS
+        ]
 
-        try:
-            result = self.execute_query(query)
-            print(f"Fetched {len(result)} relationship instances of type '{rel_type}'")
-            return result
-        except Exception as e:
-            print(f"Error fetching relationships of type '{rel_type}': {e}")
-            return []
-
-    def get_nodes_by_label(self, label: str) -> List[Dict[str, Any]]:
-        query = f"MATCH (n:{label}) RETURN id(n) as node_id, labels(n) as labels, properties(n) as properties"
-
-        try:
-            result = self.execute_query(query)
-            print(f"Fetched {len(result)} nodes with label '{label}'")
-            return result
-        except Exception as e:
-            print(f"Error fetching nodes with label '{label}': {e}")
-            return []
+        index = LocalVectorIndex()
+        for label in labels:
+            # read whichever property the live index of this label is built on
+            alias = aliases.get(f"node_embeddings_{label}", {})
+            property = alias.get("property", "embedding")
+            for page in self.iter_node_embeddings(label, property, batch_size=1000):
+                index.add(
+                    label,
+                    ids=[node["node_id"] for node in page],
+                    vectors=np.array(
+                        [node["embedding"] for node in page], dtype=np.float32
+                    ),
+                    metadata=[
+                        {
+                            k: v
+                            for k, v in {
+                                **node["properties"],
+                                "city": node["city"],
+                                "country": node["country"],
+                            }.items()
+                            if v is not None
+                        }
+                        for node in page
+                    ],
+                )
+        index.build()
+        if "Hotel" in labels:
+            self._check_location_filter(index)
+        index.save(directory)
+        return index
 
     def store_node_embeddings_batch(
-        self, node_embeddings: List[Tuple[int, List[float]]]
+        self,
+        node_embeddings: List[Tuple[int, np.ndarray]],
+        property: str = "embedding",
     ) -> int:
+        # the procedure stores a float32 array property instead of a float64 list
         query = """
         UNWIND $batch as item
         MATCH (n)
         WHERE id(n) = item.node_id
-        SET n.embedding = item.embedding
+        CALL db.create.setNodeVectorProperty(n, $property, item.embedding)
         """
 
         try:
+            # Bolt has no float32 list type, vectors become lists only here
             batch_data = [
-                {"node_id": node_id, "embedding": embedding}
+                {"node_id": node_id, "embedding": embedding.tolist()}
                 for node_id, embedding in node_embeddings
             ]
 
-            with self.driver.session() as session:
-                session.run(query, batch=batch_data)
+            with self.driver.session(database=self.database) as session:
+                session.run(query, batch=batch_data, property=property)
 
             print(f"Successfully stored {len(node_embeddings)} embeddings")
             return len(node_embeddings)
@@ -126,23 +438,25 @@ class Neo4jConnection:
             return 0
 
     def store_relationship_embeddings_batch(
-        self, relationship_embeddings: List[Tuple[int, List[float]]]
+        self,
+        relationship_embeddings: List[Tuple[int, np.ndarray]],
+        property: str = "embedding",
     ) -> int:
         query = """
         UNWIND $batch as item
         MATCH ()-[r]->()
         WHERE id(r) = item.rel_id
-        SET r.embedding = item.embedding
+        CALL db.create.setRelationshipVectorProperty(r, $property, item.embedding)
         """
 
         try:
             batch_data = [
-                {"rel_id": rel_id, "embedding": embedding}
+                {"rel_id": rel_id, "embedding": embedding.tolist()}
                 for rel_id, embedding in relationship_embeddings
             ]
 
-            with self.driver.session() as session:
-                session.run(query, batch=batch_data)
+            with self.driver.session(database=self.database) as session:
+                session.run(query, batch=batch_data, property=property)
 
             print(
                 f"Successfully stored {len(relationship_embeddings)} relationship embeddings"
@@ -152,16 +466,180 @@ class Neo4jConnection:
             print(f"Error in batch storing relationship embeddings: {e}")
             return 0
 
-    def create_node_vector_index(self):
+    def get_vector_aliases(self, kind: str) -> Dict[str, Dict[str, str]]:
+        """Stable index name -> versioned index and property it currently serves."""
+        query = f"""
+        MATCH (a:{VECTOR_ALIAS_LABEL} {{kind: $kind}})
+        RETURN a.name as name, a.index as index, a.property as property
+        """
+        return {
+            record["name"]: {"index": record["index"], "property": record["property"]}
+            for record in self.execute_query(query, {"kind": kind})
+        }
+
+    def switch_vector_aliases(
+        self, kind: str, targets: Dict[str, Tuple[str, str]]
+    ) -> Dict[str, Dict[str, str]]:
+        """Repoint aliases in a single transaction and return what they served before.
+
+        Aliases that did not exist yet served the legacy index, which is named
+        like the alias and built on the plain embedding property.
+        """
+        query = f"""
+        UNWIND $targets as target
+        MERGE (a:{VECTOR_ALIAS_LABEL} {{name: target.name}})
+        WITH a, target, a.index as previous_index, a.property as previous_property
+        SET a.kind = $kind, a.index = target.index, a.property = target.property
+        RETURN a.name as name, previous_index, previous_property
+        """
+        rows = [
+            {"name": name, "index": index, "property": property}
+            for name, (index, property) in targets.items()
+        ]
+
+        def work(tx):
+            return [record.data() for record in tx.run(query, targets=rows, kind=kind)]
+
+        with self.driver.session(database=self.database) as session:
+            records = session.execute_write(work)
+
+        return {
+            record["name"]: {
+                "index": record["previous_index"] or record["name"],
+                "property": record["previous_property"] or "embedding",
+            }
+            for record in records
+        }
+
+    def _drop_vector_aliases(self, match_patterns: Dict[str, str], property: str):
+        """Back to plain index names: delete the aliases and what they served.
+
+        match_patterns maps each alias to the pattern matching its entities;
+        property is the one the plain indexes are built on and is kept.
+        """
+        query = f"""
+        MATCH (a:{VECTOR_ALIAS_LABEL})
+        WHERE a.name IN $names
+        WITH a, a.name as name, a.index as index_name, a.property as property
+        DELETE a
+        RETURN name, index_name, property
+        """
+        # the versioned indexes and vectors behind them are not served any more
+        for record in self.execute_query(query, {"names": list(match_patterns)}):
+            self.execute_query(f"DROP INDEX {record['index_name']} IF EXISTS")
+            if record["property"] and record["property"] != property:
+                self._remove_vector_property(
+                    match_patterns[record["name"]], record["property"]
+                )
+
+    def _remove_vector_property(self, match_pattern: str, property: str):
+        self.execute_query(f"""
+            MATCH {match_pattern}
+            WHERE x.`{property}` IS NOT NULL
+            CALL {{ WITH x REMOVE x.`{property}` }} IN TRANSACTIONS OF 10000 ROWS
+            """)
+
+    def _create_vector_index(self, index_name: str, pattern: str, property: str):
+        create_query = f"""
+        CREATE VECTOR INDEX {index_name} IF NOT EXISTS
+        FOR {pattern}
+        ON (x.`{property}`)
+        OPTIONS {{
+            indexConfig: {{
+                `vector.dimensions`: {self.embedding_dimensions},
+                `vector.similarity_function`: 'cosine'
+            }}
+        }}
+        """
+        self.execute_query(create_query)
+
+    def await_indexes_online(
+        self, index_names: List[str], timeout: int = INDEX_ONLINE_TIMEOUT
+    ) -> List[str]:
+        """Wait for the named indexes only and return the ones that are ONLINE."""
+        for index_name in index_names:
+            try:
+                self.execute_query(
+                    "CALL db.awaitIndex($name, $timeout)",
+                    {"name": index_name, "timeout": timeout},
+                )
+            except Exception as e:
+                print(f"  ✗ Index '{index_name}' did not come online: {e}")
+
+        states = self.execute_query(
+            "SHOW INDEXES YIELD name, state WHERE name IN $names RETURN name, state",
+            {"names": index_names},
+        )
+        return [record["name"] for record in states if record["state"] == "ONLINE"]
+
+    def _publish_vector_indexes(
+        self,
+        kind: str,
+        patterns: Dict[str, Tuple[str, str]],
+        property: str,
+        version: str,
+    ):
+        """Blue/green rollout: build versioned indexes, switch aliases, retire old ones.
+
+        patterns maps each alias to its (index pattern, match pattern). The
+        aliases keep serving the previous indexes until every new one is ONLINE.
+        """
+        print(f"\nBuilding {len(patterns)} {kind} vector indices, version {version}...")
+
+        versioned = {}
+        for alias, (index_pattern, _) in patterns.items():
+            index_name = f"{alias}_v{version}"
+            try:
+                self._create_vector_index(index_name, index_pattern, property)
+                versioned[alias] = index_name
+            except Exception as e:
+                print(f"  ✗ Error creating vector index '{index_name}': {e}")
+
+        online = set(self.await_indexes_online(list(versioned.values())))
+        targets = {
+            alias: (index_name, property)
+            for alias, index_name in versioned.items()
+            if index_name in online
+        }
+        for alias, index_name in versioned.items():
+            if index_name not in online:
+                print(f"  ✗ Keeping '{alias}' on its current index")
+        if not targets:
+            return
+
+        previous = self.switch_vector_aliases(kind, targets)
+        print(f"  ✓ Switched {len(targets)} aliases to version {version}")
+
+        for alias, old in previous.items():
+            self.execute_query(f"DROP INDEX {old['index']} IF EXISTS")
+            if old["property"] == property:
+                continue
+            # vectors of the retired version are dead weight in the store
+            self._remove_vector_property(patterns[alias][1], old["property"])
+            print(f"  Retired '{old['index']}' and property '{old['property']}'")
+
+    def create_node_vector_index(
+        self, property: str = "embedding", version: str = None
+    ):
         # get all labels that we've just embedded
         labels_query = "CALL db.labels()"
         labels_result = self.execute_query(labels_query)
         labels = [
             record["label"]
             for record in labels_result
-            if record["label"] != "RelationshipType"  # exclude metadata nodes
+            # exclude metadata nodes
+            if record["label"] != "RelationshipType"
+            and record["label"] not in METADATA_LABELS
         ]
 
+        if version:
+            patterns = {
+                f"node_embeddings_{label}": (f"(x:{label})", f"(x:{label})")
+                for label in labels
+            }
+            self._publish_vector_indexes("node", patterns, property, version)
+            return
+
         print(f"\nCreating vector indices for {len(labels)} node types...")
 
         created_indices = []
@@ -181,32 +659,39 @@ class Neo4jConnection:
 
             # create the vector index
             try:
-                create_query = f"""
-                CREATE VECTOR INDEX {current_index_name} IF NOT EXISTS
-                FOR (n:{label})
-                ON (n.embedding)
-                OPTIONS {{
-                    indexConfig: {{
-                        `vector.dimensions`: {DIMENSION_CONSTANT},
-                        `vector.similarity_function`: 'cosine'
-                    }}
-                }}
-                """
-                self.execute_query(create_query)
+                self._create_vector_index(current_index_name, f"(x:{label})", property)
                 print(f"  ✓ Created vector index '{current_index_name}'")
                 created_indices.append(current_index_name)
             except Exception as e:
                 print(f"  ✗ Error creating vector index for {label}: {e}")
 
+        # queries fall back to the plain index names once no alias exists
+        self._drop_vector_aliases(
+            {f"node_embeddings_{label}": f"(x:{label})" for label in labels}, property
+        )
+
         print(
-            f"\n✓ Created {len(created_indices)} vector indices with dimension {DIMENSION_CONSTANT}"
+            f"\n✓ Created {len(created_indices)} vector indices with dimension {self.embedding_dimensions}"
         )
 
-    def create_relationship_vector_index(self):
+    def create_relationship_vector_index(
+        self, property: str = "embedding", version: str = None
+    ):
 
         # Get all relationship types
         rel_types = self.get_all_relationship_types()
 
+        if version:
+            patterns = {
+                f"rel_embeddings_{rel_type}": (
+                    f"()-[x:{rel_type}]-()",
+                    f"()-[x:{rel_type}]->()",
+                )
+                for rel_type in rel_types
+            }
+            self._publish_vector_indexes("relationship", patterns, property, version)
+            return
+
         print(f"\nCreating vector indices for {len(rel_types)} relationship types...")
 
         created_indices = []
@@ -224,18 +709,7 @@ class Neo4jConnection:
 
             # Create the vector index for relationships
             try:
-                create_query = f"""
-                CREATE VECTOR INDEX {index_name} IF NOT EXISTS
-                FOR ()-[r:{rel_type}]-()
-                ON (r.embedding)
-                OPTIONS {{
-                    indexConfig: {{
-                        `vector.dimensions`: {DIMENSION_CONSTANT},
-                        `vector.similarity_function`: 'cosine'
-                    }}
-                }}
-                """
-                self.execute_query(create_query)
+                self._create_vector_index(index_name, f"()-[x:{rel_type}]-()", property)
                 print(
                     f"  ✓ Created vector index '{index_name}' for {rel_type} relationships"
                 )
@@ -243,18 +717,41 @@ class Neo4jConnection:
             except Exception as e:
                 print(f"  ✗ Error creating vector index for {rel_type}: {e}")
 
+        self._drop_vector_aliases(
+            {
+                f"rel_embeddings_{rel_type}": f"()-[x:{rel_type}]->()"
+                for rel_type in rel_types
+            },
+            property,
+        )
+
         print(
-            f"\n✓ Created {len(created_indices)} relationship vector indices with dimension {DIMENSION_CONSTANT}"
+            f"\n✓ Created {len(created_indices)} relationship vector indices with dimension {self.embedding_dimensions}"
         )
 
-    def embed_nodes(self):
+    def _embedding_target(self, blue_green: bool = None) -> Tuple[str, str]:
+        if blue_green is None:
+            blue_green = self.config.get("VECTOR_INDEX_MODE") == "blue_green"
+        if not blue_green:
+            return "embedding", None
+
+        # a fresh property per run, the live indexes keep serving the old one
+        version = time.strftime("%Y%m%d%H%M%S")
+        return f"embedding_{version}", version
+
+    def embed_nodes(self, blue_green: bool = None):
         print("=" * 80)
         print("Starting Neo4j Node Embedding Process")
         print("=" * 80)
 
         embedding_dim = self.embedder.get_embedding_dimension()
+        property, version = self._embedding_target(blue_green)
 
-        labels = self.get_all_node_labels()
+        labels = [
+            label
+            for label in self.get_all_node_labels()
+            if label not in METADATA_LABELS
+        ]
 
         total_nodes = 0
         total_embedded = 0
@@ -265,58 +762,29 @@ class Neo4jConnection:
             print(f"Processing nodes with label: {label}")
             print(f"{'=' * 60}")
 
-            nodes = self.get_nodes_by_label(label)
+            # batches are streamed lazily by the pipeline's reader thread
+            pipeline = EmbeddingPipeline(
+                batches=self.iter_nodes_by_label(label),
+                describe=lambda node: (
+                    node["node_id"],
+                    self.embedder.generate_node_description(label, node["properties"]),
+                ),
+                embed=self.generate_embeddings,
+                write=lambda batch: self.store_node_embeddings_batch(batch, property),
+            )
+            stats = pipeline.run()
 
-            if not nodes:
+            if not stats["read"]:
                 print(f"No nodes found for label '{label}'")
-                continue
-
-            total_nodes += len(nodes)
-
-            # process nodes in batches
-            for i in range(0, len(nodes), BATCH_SIZE_CONSTANT):
-                batch = nodes[i : i + BATCH_SIZE_CONSTANT]
-                batch_num = i // BATCH_SIZE_CONSTANT + 1
-                total_batches = (
-                    len(nodes) + BATCH_SIZE_CONSTANT - 1
-                ) // BATCH_SIZE_CONSTANT
-
-                print(f"\nBatch {batch_num}/{total_batches} ({len(batch)} nodes)")
 
-                # generate descriptions for all nodes in batch
-                descriptions = []
-                node_ids = []
-
-                for node in batch:
-                    node_id = node["node_id"]
-                    properties = node["properties"]
-
-                    description = self.embedder.generate_node_description(
-                        label, properties
-                    )
-                    descriptions.append(description)
-                    node_ids.append(node_id)
-
-                    if len(descriptions) <= 3:  # show first few examples
-                        print(f"  Node {node_id}: {description[:100]}...")
-
-                print(
-                    f"  Generating embeddings for {len(descriptions)} descriptions..."
-                )
-                embeddings = self.embedder.generate_embeddings_batch(descriptions)
-
-                # store embeddings back to Neo4j
-                node_embeddings = list(zip(node_ids, embeddings))
-                embedded_count = self.store_node_embeddings_batch(node_embeddings)
-                total_embedded += embedded_count
-
-                print(f"  ✓ Completed batch {batch_num}/{total_batches}")
+            total_nodes += stats["read"]
+            total_embedded += stats["written"]
 
         # create vector index
         print(f"\n{'=' * 60}")
         print("Creating vector index...")
         print(f"{'=' * 60}")
-        self.create_node_vector_index()
+        self.create_node_vector_index(property, version)
 
         # summary
         elapsed_time = time.time() - start_time
@@ -329,13 +797,14 @@ class Neo4jConnection:
         print(f"Time elapsed: {elapsed_time:.2f} seconds")
         print(f"{'=' * 80}")
 
-    def embed_relationships(self):
+    def embed_relationships(self, blue_green: bool = None):
         print("=" * 80)
         print("Starting Neo4j Relationship Instance Embedding Process")
         print("=" * 80)
         print("Note: Storing ONE embedding per relationship INSTANCE")
 
         embedding_dim = self.embedder.get_embedding_dimension()
+        property, version = self._embedding_target(blue_green)
 
         rel_types = self.get_all_relationship_types()
 
@@ -348,64 +817,36 @@ class Neo4jConnection:
             print(f"Processing relationships of type: {rel_type}")
             print(f"{'=' * 60}")
 
-            relationships = self.get_relationships_by_type(rel_type)
+            # Pages are fetched lazily by the pipeline's reader thread
+            pipeline = EmbeddingPipeline(
+                batches=self.iter_relationships_by_type(rel_type),
+                describe=lambda rel: (
+                    rel["rel_id"],
+                    self.embedder.generate_relationship_description(
+                        rel_type,
+                        rel["rel_properties"],
+                        rel["start_properties"],
+                        rel["end_properties"],
+                    ),
+                ),
+                embed=self.generate_embeddings,
+                write=lambda batch: self.store_relationship_embeddings_batch(
+                    batch, property
+                ),
+            )
+            stats = pipeline.run()
 
-            if not relationships:
+            if not stats["read"]:
                 print(f"No relationships found for type '{rel_type}'")
-                continue
-
-            total_relationships += len(relationships)
 
-            # Process relationships in batches
-            for i in range(0, len(relationships), BATCH_SIZE_CONSTANT):
-                batch = relationships[i : i + BATCH_SIZE_CONSTANT]
-                batch_num = i // BATCH_SIZE_CONSTANT + 1
-                total_batches = (
-                    len(relationships) + BATCH_SIZE_CONSTANT - 1
-                ) // BATCH_SIZE_CONSTANT
-
-                print(
-                    f"\nBatch {batch_num}/{total_batches} ({len(batch)} relationships)"
-                )
-
-                # Generate descriptions for all relationships in batch
-                descriptions = []
-                rel_ids = []
-
-                for rel in batch:
-                    rel_id = rel["rel_id"]
-                    rel_properties = rel["rel_properties"]
-                    start_properties = rel["start_properties"]
-                    end_properties = rel["end_properties"]
-
-                    description = self.embedder.generate_relationship_description(
-                        rel_type, rel_properties, start_properties, end_properties
-                    )
-                    descriptions.append(description)
-                    rel_ids.append(rel_id)
-
-                    if len(descriptions) <= 3:  # Show first few examples
-                        print(f"  Relationship {rel_id}: {description[:100]}...")
-
-                print(
-                    f"  Generating embeddings for {len(descriptions)} descriptions..."
-                )
-                embeddings = self.embedder.generate_embeddings_batch(descriptions)
-
-                # Store embeddings back to Neo4j
-                rel_embeddings = list(zip(rel_ids, embeddings))
-                embedded_count = self.store_relationship_embeddings_batch(
-                    rel_embeddings
-                )
-                total_embedded += embedded_count
-
-                print(f"  ✓ Completed batch {batch_num}/{total_batches}")
+            total_relationships += stats["read"]
+            total_embedded += stats["written"]
 
         # Create vector indices
         print(f"\n{'=' * 60}")
         print("Creating relationship vector indices...")
         print(f"{'=' * 60}")
-        self.create_relationship_vector_index()
+        self.create_relationship_vector_index(property, version)
 
         # Summary
         elapsed_time = time.time() - start_time
@@ -418,6 +859,25 @@ class Neo4jConnection:
         print(f"Time elapsed: {elapsed_time:.2f} seconds")
         print(f"{'=' * 80}")
 
+    def vector_search(
+        self, label: str, query_text: str, k: int = 10
+    ) -> List[Dict[str, Any]]:
+        """Nearest nodes of a label through the index its alias currently points at."""
+        embedding = self.embedder.generate_embeddings_batch([query_text])[0]
+
+        result = self.execute_query(
+            VECTOR_SEARCH_QUERY,
+            {
+                "alias": f"node_embeddings_{label}",
+                "k": k,
+                "embedding": embedding.tolist(),
+            },
+        )
+        return [
+            {"properties": dict(record["properties"]), "score": record["score"]}
+            for record in result
+        ]
+
     def verify_node_embeddings(self):
         print("\n" + "=" * 60)
         print("Verifying Node Embeddings")
@@ -426,7 +886,8 @@ class Neo4jConnection:
         # Count nodes with embeddings (excluding RelationshipType metadata nodes)
         query = """
         MATCH (n)
-        WHERE n.embedding IS NOT NULL AND NOT 'RelationshipType' IN labels(n)
+        WHERE any(key IN keys(n) WHERE key STARTS WITH 'embedding')
+          AND NOT 'RelationshipType' IN labels(n)
         RETURN labels(n)[0] as label, count(n) as count
         ORDER BY count DESC
         """
@@ -445,8 +906,9 @@ class Neo4jConnection:
         # Show a sample embedding
         sample_query = """
         MATCH (n)
-        WHERE n.embedding IS NOT NULL AND NOT 'RelationshipType' IN labels(n)
-        RETURN labels(n)[0] as label, properties(n) as props, size(n.embedding) as embedding_size
+        WITH n, [key IN keys(n) WHERE key STARTS WITH 'embedding'][0] as property
+        WHERE property IS NOT NULL AND NOT 'RelationshipType' IN labels(n)
+        RETURN labels(n)[0] as label, properties(n) as props, size(n[property]) as embedding_size
         LIMIT 1
         """
 
@@ -466,7 +928,7 @@ class Neo4jConnection:
         # Count relationships with embeddings by type
         query = """
         MATCH ()-[r]->()
-        WHERE r.embedding IS NOT NULL
+        WHERE any(key IN keys(r) WHERE key STARTS WITH 'embedding')
         RETURN type(r) as rel_type, count(r) as count
         ORDER BY count DESC
         """
@@ -490,9 +952,11 @@ class Neo4jConnection:
         # Show a sample embedding
         sample_query = """
         MATCH (start)-[r]->(end)
-        WHERE r.embedding IS NOT NULL
+        WITH start, r, end,
+             [key IN keys(r) WHERE key STARTS WITH 'embedding'][0] as property
+        WHERE property IS NOT NULL
         RETURN type(r) as rel_type, 
-               size(r.embedding) as embedding_size,
+               size(r[property]) as embedding_size,
                labels(start)[0] as start_label,
                labels(end)[0] as end_label
         LIMIT 1
@@ -508,4 +972,4 @@ class Neo4jConnection:
             print(f"  ✓ Relationship instance embeddings verified!")
 
 
-__all__ = ["Neo4jConnection"]
+__all__ = ["Neo4jConnection", "run_steps", "run_steps_async", "warm_up_steps"]
@@ -0,0 +1,26 @@
+import multiprocessing
+import os
+
+# gunicorn -c acl_ms_3/shared/gunicorn.conf.py acl_ms_3.shared.api:app
+
+bind = os.environ.get("API_BIND", "0.0.0.0:5000")
+workers = int(os.environ.get("API_WORKERS", multiprocessing.cpu_count()))
+
+# requests mostly wait on Neo4j, so each worker serves several at once; keep
+# NEO4J_MAX_POOL_SIZE at or above this
+worker_class = "gthread"
+threads = int(os.environ.get("API_THREADS", 4))
+
+# the app is imported after the fork: a Neo4j driver must not be shared
+# between processes, so every worker opens its own pool and loads spaCy
+preload_app = False
+
+timeout = 30
+keepalive = 5
+accesslog = "-"
+
+
+def worker_exit(server, worker):
+    from acl_ms_3.shared import api
+
+    api.neo4j_conn.close()
@@ -0,0 +1,126 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+DEFAULT_MAX_ENTRIES: int = 1024
+DEFAULT_TTL_SECONDS: float = 3600
+# how stale the graph version seen by the cache may get
+VERSION_CHECK_SECONDS: float = 30
+
+
+class QueryResultCache:
+    """In-memory LRU cache of query results with a TTL per entry.
+
+    The graph only changes when the loader runs, and the loader stamps a new
+    graph version each time. Callers report the version they observe through
+    observe_version(), and the whole cache is dropped when it changes. Every
+    entry is tagged with the version it was computed under, so a result that
+    was still being computed when the version changed is never served.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        version_check_seconds: float = VERSION_CHECK_SECONDS,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.version_check_seconds = version_check_seconds
+
+        self.graph_version = None
+        self._version_checked_at = None
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @classmethod
+    def from_config(cls, config: Dict[str, str]) -> "QueryResultCache":
+        return cls(
+            max_entries=int(
+                config.get("RESULT_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)
+            ),
+            ttl_seconds=float(
+                config.get("RESULT_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS)
+            ),
+        )
+
+    def version_due(self) -> bool:
+        checked_at = self._version_checked_at
+        return (
+            checked_at is None
+            or time.monotonic() - checked_at >= self.version_check_seconds
+        )
+
+    def observe_version(self, version: Any):
+        with self._lock:
+            self._version_checked_at = time.monotonic()
+            if version == self.graph_version:
+                return
+            if self._entries:
+                self.invalidations += 1
+                print(
+                    f"Graph version {self.graph_version} -> {version}, "
+                    f"dropping {len(self._entries)} cached results"
+                )
+            self._entries.clear()
+            self.graph_version = version
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            stored_at, version, value = entry
+            if version != self.graph_version:
+                del self._entries[key]
+                self.misses += 1
+                return None
+            if time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any, version: Any):
+        """Store value computed under graph version; refused if that is stale."""
+        with self._lock:
+            if version != self.graph_version:
+                return
+            self._entries[key] = (time.monotonic(), version, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "expirations": self.expirations,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "graph_version": self.graph_version,
+        }
+
+
+__all__ = ["QueryResultCache"]
@@ -0,0 +1,175 @@
+import argparse
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from acl_ms_3.baseline.queries import PARAM_SAMPLES, queries, query_parameters
+from acl_ms_3.shared.database import INDEX_ONLINE_TIMEOUT, Neo4jConnection
+
+# run after the loader (acl-ms/main.py) has built or synced the graph:
+#   python -m acl_ms_3.shared.schema
+
+NODE_PATTERN = re.compile(r"\((\w+):(\w+)\)")
+PROPERTY_PATTERN = re.compile(r"\b(\w+)\.(\w+)\b")
+EQUALITY_PATTERN = re.compile(r"\b(\w+)\.(\w+)\s*=\s*\$")
+# the parts of a template that filter or sort, RETURN projections need no index
+FILTER_CLAUSES = re.compile(
+    r"\b(?:WHERE|ORDER BY)\b(.*?)(?=\bRETURN\b|\bLIMIT\b|\bWITH\b|$)", re.S
+)
+
+
+def index_name(label: str, properties: Tuple[str, ...]) -> str:
+    return f"{label.lower()}_{'_'.join(properties)}"
+
+
+def template_indexes(query: str) -> List[Tuple[str, Tuple[str, ...]]]:
+    """(label, properties) range indexes one template can use.
+
+    Every property filtered or sorted on gets a single-property index, and
+    two or more equality filters on the same node also get a composite one.
+    """
+    labels = dict(NODE_PATTERN.findall(query))
+    clauses = " ".join(FILTER_CLAUSES.findall(query))
+
+    indexes = []
+    for variable, property in PROPERTY_PATTERN.findall(clauses):
+        if variable in labels:
+            indexes.append((labels[variable], (property,)))
+
+    equality = {}
+    for variable, property in EQUALITY_PATTERN.findall(clauses):
+        if variable in labels:
+            equality.setdefault(variable, []).append(property)
+    for variable, properties in equality.items():
+        if len(properties) > 1:
+            indexes.append((labels[variable], tuple(sorted(set(properties)))))
+
+    return indexes
+
+
+def required_indexes(templates: List[Dict[str, Any]] = queries) -> Dict[str, Tuple]:
+    """Index name -> (label, properties) for every template in the registry."""
+    indexes = {}
+    for query_element in templates:
+        for label, properties in template_indexes(query_element["query"]):
+            indexes.setdefault(index_name(label, properties), (label, properties))
+    return indexes
+
+
+def create_indexes(
+    conn: Neo4jConnection,
+    indexes: Dict[str, Tuple],
+    timeout: int = INDEX_ONLINE_TIMEOUT,
+) -> List[str]:
+    """Create the range indexes and wait until they are ONLINE; returns the online ones."""
+    # uniqueness constraints already own an index on their key, and Neo4j
+    # refuses a second one over the same schema
+    existing = {
+        (record["labels"][0], tuple(record["properties"])): record["name"]
+        for record in conn.execute_query(
+            "SHOW INDEXES YIELD name, type, entityType, labelsOrTypes, properties "
+            "WHERE type = 'RANGE' AND entityType = 'NODE' "
+            "RETURN name, labelsOrTypes AS labels, properties"
+        )
+    }
+    indexes = {
+        existing.get((label, properties), name): (label, properties)
+        for name, (label, properties) in indexes.items()
+    }
+
+    # an index on a property the loader never writes stays empty forever
+    property_keys = {
+        record["propertyKey"] for record in conn.execute_query("CALL db.propertyKeys()")
+    }
+
+    print(f"\nCreating {len(indexes)} range indexes...")
+    for name, (label, properties) in list(indexes.items()):
+        missing = [property for property in properties if property not in property_keys]
+        if missing:
+            print(f"  - {name} skipped, no data has {', '.join(missing)}")
+            del indexes[name]
+            continue
+        if (label, properties) in existing:
+            print(f"  - {name} on :{label}({', '.join(properties)}) already exists")
+            continue
+        columns = ", ".join(f"n.{property}" for property in properties)
+        try:
+            conn.execute_query(
+                f"CREATE INDEX {name} IF NOT EXISTS FOR (n:{label}) ON ({columns})"
+            )
+            print(f"  ✓ {name} on :{label}({', '.join(properties)})")
+        except Exception as e:
+            print(f"  ✗ Could not create index '{name}': {e}")
+
+    # waits on these indexes only, not on unrelated ones still populating
+    online = conn.await_indexes_online(list(indexes), timeout)
+    print(f"{len(online)}/{len(indexes)} indexes ONLINE")
+    return online
+
+
+def _plan_db_hits(plan: Optional[Dict[str, Any]]) -> int:
+    if not plan:
+        return 0
+    return plan.get("dbHits", 0) + sum(
+        _plan_db_hits(child) for child in plan.get("children", [])
+    )
+
+
+def profile_templates(conn: Neo4jConnection) -> List[Optional[int]]:
+    """Total db hits of every template under PROFILE, with representative parameters."""
+    db_hits = []
+    with conn.driver.session(database=conn.database) as session:
+        for template_id, query_element in enumerate(queries):
+            try:
+                summary = session.run(
+                    f"PROFILE {query_element['query']}",
+                    query_parameters(template_id, PARAM_SAMPLES),
+                ).consume()
+                db_hits.append(_plan_db_hits(summary.profile))
+            except Exception as e:
+                print(f"Error profiling query {template_id + 1}: {e}")
+                db_hits.append(None)
+    return db_hits
+
+
+def print_report(before: List[Optional[int]], after: List[Optional[int]]):
+    print(f"\n{'query':<8}{'db hits before':>16}{'db hits after':>16}{'change':>10}")
+    for template_id, (hits_before, hits_after) in enumerate(zip(before, after)):
+        if hits_before and hits_after is not None:
+            change = f"{(hits_after - hits_before) / hits_before:+.0%}"
+        else:
+            change = "-"
+        print(
+            f"{template_id + 1:<8}{str(hits_before):>16}{str(hits_after):>16}{change:>10}"
+        )
+
+
+__all__ = [
+    "required_indexes",
+    "create_indexes",
+    "profile_templates",
+]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Create the range indexes the routed query templates need"
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="only list the derived indexes"
+    )
+    parser.add_argument("--timeout", type=int, default=INDEX_ONLINE_TIMEOUT)
+    args = parser.parse_args()
+
+    indexes = required_indexes()
+    if args.dry_run:
+        for name, (label, properties) in indexes.items():
+            print(f"{name}: :{label}({', '.join(properties)})")
+    else:
+        conn = Neo4jConnection()
+        try:
+            before = profile_templates(conn)
+            create_indexes(conn, indexes, args.timeout)
+            after = profile_templates(conn)
+            print_report(before, after)
+        finally:
+            conn.close()